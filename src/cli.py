@@ -1,7 +1,7 @@
 """Command-line interface for Sayu."""
 
-import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 
@@ -10,13 +10,52 @@ from rich.console import Console
 
 from .collectors import ClaudeCodeCollector, GitCollector
 from .config import Config
-from .core import Storage
+from .core import Event, Storage
 from .engine import LLMProvider, Summarizer
 from .visualizer import TimelineVisualizer
 
 console = Console()
 
 
+def _print_summary(
+    summarizer: Summarizer,
+    events: list[Event],
+    command: str | None,
+    status: str,
+    heading: str,
+    structured: bool = False,
+) -> None:
+    """Summarize events together, printing the summary as it streams in."""
+    spinner = console.status(status)
+    spinner.start()
+    streamed: list[str] = []
+
+    def print_token(token: str) -> None:
+        if not streamed:
+            spinner.stop()
+            console.print(heading)
+        streamed.append(token)
+        console.print(token, end="", markup=False, highlight=False)
+
+    try:
+        summary = summarizer.summarize_all(
+            events, command=command, structured=structured, on_token=print_token
+        )
+    finally:
+        spinner.stop()
+
+    # Cached, CLI and structured summaries arrive in one piece
+    if not streamed:
+        console.print(heading)
+        console.print(summary)
+        return
+
+    console.print()
+    # A stream cut short returns an error instead of the text shown so far
+    if summary != "".join(streamed):
+        console.print(summary)
+
+
 @click.group()
 @click.version_option(version="1.1.0", prog_name="sayu")
 def cli():
@@ -61,23 +100,35 @@ def collect():
     # Collect from all enabled sources
     total_events = 0
 
-    if config.get_collector_config("claude-code").get("enabled", True):
-        collector = ClaudeCodeCollector()
-        events = collector.collect(since=latest)
-        if events:
-            storage.add_events(events)
-            total_events += len(events)
-            console.print(
-                f"[green]✓[/green] Collected {len(events)} events from claude-code"
-            )
+    # Claude Code events are read on a worker thread while git runs its
+    # subprocesses here; all storage writes stay on this thread
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        claude_events = None
+        if config.get_collector_config("claude-code").get("enabled", True):
+            collector = ClaudeCodeCollector()
+            claude_events = executor.submit(collector.collect, since=latest)
+
+        git_events = 0
+        if config.get_collector_config("git").get("enabled", True):
+            git_collector = GitCollector()
+            # Store each batch as git output is parsed, one transaction per batch
+            for batch in git_collector.collect_batched(since=latest):
+                storage.add_events(batch)
+                git_events += len(batch)
+
+        if claude_events is not None:
+            events = claude_events.result()
+            if events:
+                storage.add_events(events)
+                total_events += len(events)
+                console.print(
+                    f"[green]✓[/green] Collected {len(events)} events from claude-code"
+                )
+            collector.commit_offsets()
 
-    if config.get_collector_config("git").get("enabled", True):
-        git_collector = GitCollector()
-        events = git_collector.collect(since=latest)
-        if events:
-            storage.add_events(events)
-            total_events += len(events)
-            console.print(f"[green]✓[/green] Collected {len(events)} events from git")
+    if git_events:
+        total_events += git_events
+        console.print(f"[green]✓[/green] Collected {git_events} events from git")
 
     if total_events == 0:
         console.print("[yellow]No new events collected[/yellow]")
@@ -131,63 +182,26 @@ def summarize(hours: int, engine: str, last: int, since_commit: bool, structured
     if since_commit and not last:
         git_collector = GitCollector()
 
-        # Get the last two commits to find the range
-        try:
-            result = subprocess.run(
-                ["git", "log", "--pretty=format:%H|%ad", "--date=iso", "-2"],
-                cwd=Path.cwd(),
-                capture_output=True,
-                text=True,
-                timeout=5,
+        # Get the second-to-last commit time to cover the last two commits;
+        # with a single commit, fall back to its own time
+        second_commit_time = git_collector._get_commit_time("HEAD~1")
+        last_commit_time = (
+            None if second_commit_time else git_collector._get_last_commit_time()
+        )
+        git_collector.close()
+
+        if second_commit_time:
+            since = second_commit_time
+            console.print(
+                f"[dim]Summarizing events between last two commits (since {since.strftime('%Y-%m-%d %H:%M:%S')})[/dim]"
             )
-            if result.returncode == 0 and result.stdout.strip():
-                lines = result.stdout.strip().split("\n")
-                if len(lines) >= 2:
-                    # Get time of second-to-last commit
-                    second_commit_parts = lines[1].split("|")
-                    if len(second_commit_parts) >= 2:
-                        date_str = second_commit_parts[1]
-                        if "+" in date_str:
-                            date_str = date_str.split("+")[0].strip()
-                        if " " in date_str:
-                            date_str = date_str.replace(" ", "T")
-                        since = datetime.fromisoformat(date_str)
-                        console.print(
-                            f"[dim]Summarizing events between last two commits (since {since.strftime('%Y-%m-%d %H:%M:%S')})[/dim]"
-                        )
-                    else:
-                        # Fallback to last commit time
-                        last_commit_time = git_collector._get_last_commit_time()
-                        if last_commit_time:
-                            since = last_commit_time
-                            console.print(
-                                f"[dim]Summarizing events since last commit: {since.strftime('%Y-%m-%d %H:%M:%S')}[/dim]"
-                            )
-                        else:
-                            console.print(
-                                "[yellow]No commits found, using last 24 hours[/yellow]"
-                            )
-                            since = datetime.now() - timedelta(hours=24)
-                else:
-                    # Only one commit, use its time
-                    last_commit_time = git_collector._get_last_commit_time()
-                    if last_commit_time:
-                        since = last_commit_time
-                        console.print(
-                            f"[dim]Summarizing events since last commit: {since.strftime('%Y-%m-%d %H:%M:%S')}[/dim]"
-                        )
-                    else:
-                        console.print(
-                            "[yellow]No commits found, using last 24 hours[/yellow]"
-                        )
-                        since = datetime.now() - timedelta(hours=24)
-            else:
-                console.print("[yellow]No commits found, using last 24 hours[/yellow]")
-                since = datetime.now() - timedelta(hours=24)
-        except Exception:
+        elif last_commit_time:
+            since = last_commit_time
             console.print(
-                "[yellow]Error getting commit history, using last 24 hours[/yellow]"
+                f"[dim]Summarizing events since last commit: {since.strftime('%Y-%m-%d %H:%M:%S')}[/dim]"
             )
+        else:
+            console.print("[yellow]No commits found, using last 24 hours[/yellow]")
             since = datetime.now() - timedelta(hours=24)
     else:
         # Use time-based approach
@@ -203,23 +217,26 @@ def summarize(hours: int, engine: str, last: int, since_commit: bool, structured
 
     # Create summarizer
     if engine:
-        summarizer = Summarizer(LLMProvider.CUSTOM)
+        summarizer = Summarizer(LLMProvider.CUSTOM, storage=storage)
         command = engine
     else:
         provider = LLMProvider(config.default_provider)
-        summarizer = Summarizer(provider)
+        summarizer = Summarizer(provider, storage=storage)
         command = None
 
     # Summarize
-    with console.status("[bold green]Summarizing events..."):
-        if since_commit and not last:
-            # For commit-based approach, summarize all events together
-            summary = summarizer.summarize_all(
-                events, command=command, structured=structured
-            )
-            console.print(f"\n[bold]Summary ({len(events)} events):[/bold]")
-            console.print(summary)
-        else:
+    if since_commit and not last:
+        # For commit-based approach, summarize all events together
+        _print_summary(
+            summarizer,
+            events,
+            command,
+            "[bold green]Summarizing events...",
+            f"\n[bold]Summary ({len(events)} events):[/bold]",
+            structured=structured,
+        )
+    else:
+        with console.status("[bold green]Summarizing events...") as status:
             # For time-based approach, use timeframe
             timeframe_hours = hours or config.timeframe_hours
             if timeframe_hours is None:
@@ -229,7 +246,13 @@ def summarize(hours: int, engine: str, last: int, since_commit: bool, structured
                 return
             timeframe = timedelta(hours=timeframe_hours)
             summaries = summarizer.summarize_timeframe(
-                events, timeframe, command=command, structured=structured
+                events,
+                timeframe,
+                command=command,
+                structured=structured,
+                on_progress=lambda message: status.update(
+                    f"[bold green]Summarizing events...[/bold green] [dim]{message}"
+                ),
             )
             # Show results
             visualizer.show_summary_timeline(summaries)
@@ -257,6 +280,7 @@ def _summarize_since_last_commit_impl(engine: str):
     # Get last commit time
     git_collector = GitCollector()
     last_commit_time = git_collector._get_last_commit_time()
+    git_collector.close()
 
     if not last_commit_time:
         console.print("[yellow]No commits found in this repository[/yellow]")
@@ -275,20 +299,21 @@ def _summarize_since_last_commit_impl(engine: str):
 
     # Create summarizer
     if engine:
-        summarizer = Summarizer(LLMProvider.CUSTOM)
+        summarizer = Summarizer(LLMProvider.CUSTOM, storage=storage)
         command = engine
     else:
         provider = LLMProvider(config.default_provider)
-        summarizer = Summarizer(provider)
+        summarizer = Summarizer(provider, storage=storage)
         command = None
 
     # Summarize all events since last commit
-    with console.status("[bold green]Summarizing events since last commit..."):
-        summary = summarizer.summarize_all(events, command=command)
-
-    # Show results
-    console.print(f"\n[bold]Summary since last commit ({len(events)} events):[/bold]")
-    console.print(summary)
+    _print_summary(
+        summarizer,
+        events,
+        command,
+        "[bold green]Summarizing events since last commit...",
+        f"\n[bold]Summary since last commit ({len(events)} events):[/bold]",
+    )
 
 
 @cli.command()
@@ -310,46 +335,49 @@ def diff(commit_range: str, engine: str, show_events: bool):
     # Initialize git collector
     git_collector = GitCollector()
 
-    # Get commit range
-    if not commit_range:
-        # Default: since last commit
-        last_commit_time = git_collector._get_last_commit_time()
-        if not last_commit_time:
-            console.print("[yellow]No commits found in this repository[/yellow]")
-            return
-        since_time = last_commit_time
-        console.print(
-            f"[dim]Collecting events since last commit: {since_time.strftime('%Y-%m-%d %H:%M:%S')}[/dim]"
-        )
-    else:
-        # Parse commit range
-        if ".." in commit_range:
-            from_commit, to_commit = commit_range.split("..", 1)
-            since_time = git_collector._get_commit_time(from_commit)
-            until_time = git_collector._get_commit_time(to_commit)
-
-            if not since_time:
-                console.print(f"[red]Commit {from_commit} not found[/red]")
-                return
-            if not until_time:
-                console.print(f"[red]Commit {to_commit} not found[/red]")
+    # Get commit range; the commit lookups share one git process
+    try:
+        if not commit_range:
+            # Default: since last commit
+            last_commit_time = git_collector._get_last_commit_time()
+            if not last_commit_time:
+                console.print("[yellow]No commits found in this repository[/yellow]")
                 return
-
+            since_time = last_commit_time
             console.print(
-                f"[dim]Collecting events between {from_commit} and {to_commit}[/dim]"
-            )
-            console.print(
-                f"[dim]Time range: {since_time.strftime('%Y-%m-%d %H:%M:%S')} - {until_time.strftime('%Y-%m-%d %H:%M:%S')}[/dim]"
+                f"[dim]Collecting events since last commit: {since_time.strftime('%Y-%m-%d %H:%M:%S')}[/dim]"
             )
         else:
-            # Single commit - show events since that commit
-            since_time = git_collector._get_commit_time(commit_range)
-            if not since_time:
-                console.print(f"[red]Commit {commit_range} not found[/red]")
-                return
-            console.print(
-                f"[dim]Collecting events since commit {commit_range}: {since_time.strftime('%Y-%m-%d %H:%M:%S')}[/dim]"
-            )
+            # Parse commit range
+            if ".." in commit_range:
+                from_commit, to_commit = commit_range.split("..", 1)
+                since_time = git_collector._get_commit_time(from_commit)
+                until_time = git_collector._get_commit_time(to_commit)
+
+                if not since_time:
+                    console.print(f"[red]Commit {from_commit} not found[/red]")
+                    return
+                if not until_time:
+                    console.print(f"[red]Commit {to_commit} not found[/red]")
+                    return
+
+                console.print(
+                    f"[dim]Collecting events between {from_commit} and {to_commit}[/dim]"
+                )
+                console.print(
+                    f"[dim]Time range: {since_time.strftime('%Y-%m-%d %H:%M:%S')} - {until_time.strftime('%Y-%m-%d %H:%M:%S')}[/dim]"
+                )
+            else:
+                # Single commit - show events since that commit
+                since_time = git_collector._get_commit_time(commit_range)
+                if not since_time:
+                    console.print(f"[red]Commit {commit_range} not found[/red]")
+                    return
+                console.print(
+                    f"[dim]Collecting events since commit {commit_range}: {since_time.strftime('%Y-%m-%d %H:%M:%S')}[/dim]"
+                )
+    finally:
+        git_collector.close()
 
     # Get events in the range
     if "until_time" in locals():
@@ -368,20 +396,21 @@ def diff(commit_range: str, engine: str, show_events: bool):
 
     # Create summarizer
     if engine:
-        summarizer = Summarizer(LLMProvider.CUSTOM)
+        summarizer = Summarizer(LLMProvider.CUSTOM, storage=storage)
         command = engine
     else:
         provider = LLMProvider(config.default_provider)
-        summarizer = Summarizer(provider)
+        summarizer = Summarizer(provider, storage=storage)
         command = None
 
     # Summarize events
-    with console.status("[bold green]Summarizing events..."):
-        summary = summarizer.summarize_all(events, command=command)
-
-    # Show summary
-    console.print(f"\n[bold]Summary ({len(events)} events):[/bold]")
-    console.print(summary)
+    _print_summary(
+        summarizer,
+        events,
+        command,
+        "[bold green]Summarizing events...",
+        f"\n[bold]Summary ({len(events)} events):[/bold]",
+    )
 
 
 @cli.command()
@@ -414,6 +443,7 @@ def watch():
 
                 # Update last check
                 last_check = max(e.timestamp for e in events)
+            collector.commit_offsets()
 
             time.sleep(5)  # Check every 5 seconds
 
@@ -428,8 +458,8 @@ def stats():
     storage = Storage(config.db_path)
     visualizer = TimelineVisualizer()
 
-    # Get all events
-    events = storage.get_events()
+    # Get all events; the stats only look at source, type and time
+    events = storage.get_events(with_metadata=False)
 
     if not events:
         console.print("[yellow]No events collected yet[/yellow]")
@@ -1,11 +1,117 @@
 """Claude Code hook collector."""
 
+import importlib.util
 import json
+import py_compile
+import re
+import shlex
+import sys
 from datetime import datetime
 from pathlib import Path
+from typing import Any
 
 from ..core import Collector, Event, EventType
 
+# Map hook metadata types to event types
+_META_TO_TYPE = {
+    "user_request": EventType.CONVERSATION,
+    "assistant": EventType.CONVERSATION,
+}
+
+# Map tool names to event types for tool_use records
+_TOOL_TO_TYPE = {
+    "Edit": EventType.FILE_EDIT,
+    "Write": EventType.FILE_EDIT,
+    "MultiEdit": EventType.FILE_EDIT,
+    "Bash": EventType.COMMAND,
+}
+
+
+def _classify_event(metadata: dict[str, Any]) -> EventType:
+    """Map hook metadata to an event type with at most one table lookup."""
+    meta_type = metadata.get("type", "")
+    if meta_type == "tool_use":
+        return _TOOL_TO_TYPE.get(metadata.get("tool", ""), EventType.ACTION)
+    return _META_TO_TYPE.get(meta_type, EventType.ACTION)
+
+
+# All 9 Claude Code hook event types
+_CLAUDE_HOOK_EVENTS = (
+    "PreToolUse",
+    "PostToolUse",
+    "UserPromptSubmit",
+    "Stop",
+    "SubagentStop",
+    "PreCompact",
+    "SessionStart",
+    "SessionEnd",
+    "Notification",
+)
+
+_TIMESTAMP_KEY = '"timestamp": "'
+
+
+def _build_hooks_config(command: str) -> dict[str, list[dict]]:
+    """Build the settings.json hook configuration for all event types."""
+    return {
+        event_type: [
+            {"matcher": "*", "hooks": [{"type": "command", "command": command}]}
+        ]
+        for event_type in _CLAUDE_HOOK_EVENTS
+    }
+
+
+def _fast_ts_prefilter(line: str, since_iso: str) -> bool:
+    """
+    Check whether a raw JSONL line may be newer than since_iso.
+
+    The hook script writes the timestamp as the first field, so it can be
+    located without parsing the whole record.
+
+    Args:
+        line: Raw JSONL line
+        since_iso: ISO-8601 lower bound (exclusive)
+
+    Returns:
+        False if the line is known to be old, True otherwise
+    """
+    start = line.find(_TIMESTAMP_KEY)
+    if start == -1:
+        return True
+    start += len(_TIMESTAMP_KEY)
+    end = line.find('"', start)
+    if end == -1:
+        return True
+    return line[start:end] > since_iso
+
+
+# The hook writes metadata["cwd"] as the last field of every record
+_TRAILING_CWD_RE = re.compile(r'"cwd": "((?:[^"\\]|\\.)*)"\}\}\s*$')
+
+
+def _fast_cwd_prefilter(line: str, current_cwd: str) -> bool:
+    """
+    Check whether a raw JSONL line may belong to current_cwd.
+
+    Args:
+        line: Raw JSONL line
+        current_cwd: Resolved working directory being collected
+
+    Returns:
+        False if the line is known to come from another directory,
+        True otherwise
+    """
+    match = _TRAILING_CWD_RE.search(line)
+    if match is None:
+        return True
+    raw_cwd = match.group(1)
+    if not raw_cwd:
+        return True
+    if "\\" in raw_cwd:
+        # Escaped characters need a real JSON decode
+        raw_cwd = json.loads(f'"{raw_cwd}"')
+    return raw_cwd == current_cwd
+
 
 class ClaudeCodeCollector(Collector):
     """Collector for Claude Code conversations via hooks."""
@@ -19,6 +125,10 @@ class ClaudeCodeCollector(Collector):
         """
         self.hook_dir = hook_dir or Path.home() / ".sayu" / "hooks"
         self.event_file = self.hook_dir / "events.jsonl"
+        self.offset_file = self.hook_dir / "events.jsonl.offset"
+        # Read position reached by the last collect(), saved by commit_offsets()
+        self._pending_offset: tuple[str, int] | None = None
+        self.settings_path = Path.home() / ".claude" / "settings.json"
 
     def setup(self) -> None:
         """Set up Claude Code hooks."""
@@ -26,127 +136,140 @@ class ClaudeCodeCollector(Collector):
 
         # Create hook script
         hook_script = self.hook_dir / "claude_code_hook.py"
-        hook_script.write_text(self._get_hook_script())
-        hook_script.chmod(0o755)
+        hook_pyc = hook_script.with_suffix(".pyc")
+        script = self._get_hook_script()
+        # Skip rewriting the script when it is already up to date
+        if not hook_script.exists() or hook_script.read_text() != script:
+            hook_script.write_text(script)
+            hook_script.chmod(0o755)
+            hook_pyc.unlink(missing_ok=True)
+
+        # Precompile the script so each hook run skips compilation, and
+        # recompile if the interpreter's bytecode format changed
+        if (
+            not hook_pyc.exists()
+            or hook_pyc.read_bytes()[:4] != importlib.util.MAGIC_NUMBER
+        ):
+            py_compile.compile(str(hook_script), cfile=str(hook_pyc), doraise=True)
+
+        # Run in isolated mode without site import to cut interpreter startup;
+        # the hook only depends on the standard library
+        command = f"{shlex.quote(sys.executable)} -I -S {shlex.quote(str(hook_pyc))}"
 
         # Create .claude/settings.json in home directory for user-level hooks
-        settings_dir = Path.home() / ".claude"
-        settings_dir.mkdir(exist_ok=True)
-        settings_path = settings_dir / "settings.json"
-
-        # Define all 9 Claude Code event types
-        event_types = [
-            "PreToolUse",
-            "PostToolUse",
-            "UserPromptSubmit",
-            "Stop",
-            "SubagentStop",
-            "PreCompact",
-            "SessionStart",
-            "SessionEnd",
-            "Notification",
-        ]
+        self.settings_path.parent.mkdir(exist_ok=True)
 
         # Create hook configuration for all event types
-        hooks_config = {}
-        for event_type in event_types:
-            hooks_config[event_type] = [
-                {
-                    "matcher": "*",
-                    "hooks": [{"type": "command", "command": str(hook_script)}],
-                }
-            ]
-
-        settings = {"hooks": hooks_config}
+        hooks_config = _build_hooks_config(command)
 
-        if settings_path.exists():
-            # Merge with existing settings
-            existing = json.loads(settings_path.read_text())
-            existing.setdefault("hooks", {}).update(settings["hooks"])
-            settings = existing
-
-        settings_path.write_text(json.dumps(settings, indent=2))
+        # Merge with existing settings
+        settings, raw_settings = self._load_settings()
+        settings.setdefault("hooks", {}).update(hooks_config)
+        self._save_settings(settings, raw_settings)
 
     def teardown(self) -> None:
         """Remove Claude Code hooks."""
-        settings_path = Path.home() / ".claude" / "settings.json"
-        if settings_path.exists():
-            settings = json.loads(settings_path.read_text())
+        settings, raw_settings = self._load_settings()
+        if raw_settings is not None:
             if "hooks" in settings:
                 # Remove all event types
-                event_types = [
-                    "PreToolUse",
-                    "PostToolUse",
-                    "UserPromptSubmit",
-                    "Stop",
-                    "SubagentStop",
-                    "PreCompact",
-                    "SessionStart",
-                    "SessionEnd",
-                    "Notification",
-                ]
-                for event_type in event_types:
+                for event_type in _CLAUDE_HOOK_EVENTS:
                     settings["hooks"].pop(event_type, None)
 
                 if not settings["hooks"]:
                     del settings["hooks"]
 
             if settings:
-                settings_path.write_text(json.dumps(settings, indent=2))
+                self._save_settings(settings, raw_settings)
             else:
-                settings_path.unlink()
+                self.settings_path.unlink()
+
+    def _load_settings(self) -> tuple[dict, str | None]:
+        """
+        Load Claude Code settings.
+
+        Returns:
+            Parsed settings and the raw file content (None if missing)
+        """
+        if not self.settings_path.exists():
+            return {}, None
+        raw_settings = self.settings_path.read_text()
+        return json.loads(raw_settings), raw_settings
+
+    def _save_settings(self, settings: dict, raw_settings: str | None) -> None:
+        """Write Claude Code settings, skipping the write if nothing changed."""
+        new_settings = json.dumps(settings, indent=2)
+        if new_settings != raw_settings:
+            self.settings_path.write_text(new_settings)
 
     def collect(self, since: datetime | None = None) -> list[Event]:
         """Collect events from Claude Code hooks."""
         if not self.event_file.exists():
             return []
 
+        # Make since timezone-naive to match hook timestamps
+        if since and since.tzinfo is not None:
+            since = since.replace(tzinfo=None)
+
+        # ISO-8601 strings sort chronologically, so compare them directly
+        since_iso = since.isoformat() if since else None
+
         # Get current working directory to filter events
         current_cwd = str(Path.cwd().resolve())
 
+        # Resume from the last read position for incremental collections.
+        # Offsets are tracked per directory since records are filtered by cwd.
+        offsets = self._load_offsets()
+        offset = offsets.get(current_cwd, 0) if since else 0
+        if self.event_file.stat().st_size < offset:
+            # File was truncated or rotated
+            offset = 0
+        if offset:
+            # The offset alone marks what was read. Hooks that summarize
+            # before appending write records stamped earlier than events
+            # already stored, which a since filter would drop for good.
+            since_iso = None
+
+        source = self.name
         events = []
-        with open(self.event_file) as f:
-            for line in f:
+        with open(self.event_file, "rb") as f:
+            f.seek(offset)
+            for raw_line in f:
+                # Only advance past complete lines; a partial line may still
+                # be in the middle of being appended by the hook
+                if raw_line.endswith(b"\n"):
+                    offset += len(raw_line)
+
+                line = raw_line.decode("utf-8", errors="replace")
                 if not line.strip():
                     continue
 
+                # Skip old records and other projects' records before paying
+                # for the JSON parse
+                if since_iso and not _fast_ts_prefilter(line, since_iso):
+                    continue
+                if not _fast_cwd_prefilter(line, current_cwd):
+                    continue
+
                 try:
                     data = json.loads(line)
 
                     # Skip events from other repositories/directories
-                    event_cwd = data.get("metadata", {}).get("cwd", "")
+                    metadata = data.get("metadata", {})
+                    event_cwd = metadata.get("cwd", "")
                     if event_cwd and event_cwd != current_cwd:
                         continue
 
-                    timestamp = datetime.fromisoformat(data["timestamp"])
-
-                    if since and timestamp <= since:
+                    timestamp_str = data["timestamp"]
+                    if since_iso and timestamp_str <= since_iso:
                         continue
 
-                    # Map metadata type to EventType
-                    metadata = data.get("metadata", {})
-                    meta_type = metadata.get("type", "")
-
-                    # Determine event type based on metadata
-                    if meta_type == "user_request":
-                        event_type = EventType.CONVERSATION
-                    elif meta_type == "assistant":
-                        event_type = EventType.CONVERSATION
-                    elif meta_type == "tool_use":
-                        tool = metadata.get("tool", "")
-                        if tool in ["Edit", "Write", "MultiEdit"]:
-                            event_type = EventType.FILE_EDIT
-                        elif tool in ["Bash"]:
-                            event_type = EventType.COMMAND
-                        else:
-                            event_type = EventType.ACTION
-                    else:
-                        event_type = EventType.ACTION
+                    timestamp = datetime.fromisoformat(timestamp_str)
 
                     event = Event(
                         timestamp=timestamp,
-                        type=event_type,
-                        source=self.name,
+                        type=_classify_event(metadata),
+                        source=source,
                         content=data["content"],
                         metadata=metadata,
                     )
@@ -155,8 +278,41 @@ class ClaudeCodeCollector(Collector):
                     print(f"Error parsing event: {e}")
                     continue
 
+        # Saved only once the caller has stored the events; see commit_offsets
+        self._pending_offset = (current_cwd, offset)
+
         return events
 
+    def commit_offsets(self) -> None:
+        """
+        Persist the read position reached by the last collect().
+
+        Call after the collected events are stored, so that a failed write
+        leaves them to be read again by the next collection.
+        """
+        if self._pending_offset is None:
+            return
+        cwd, offset = self._pending_offset
+        offsets = self._load_offsets()
+        offsets[cwd] = offset
+        self._save_offsets(offsets)
+        self._pending_offset = None
+
+    def _load_offsets(self) -> dict[str, int]:
+        """Load persisted read offsets keyed by working directory."""
+        try:
+            offsets = json.loads(self.offset_file.read_text())
+        except (OSError, ValueError):
+            return {}
+        return offsets if isinstance(offsets, dict) else {}
+
+    def _save_offsets(self, offsets: dict[str, int]) -> None:
+        """Persist read offsets keyed by working directory."""
+        try:
+            self.offset_file.write_text(json.dumps(offsets))
+        except OSError:
+            pass
+
     @property
     def name(self) -> str:
         """Return collector name."""
@@ -164,82 +320,146 @@ class ClaudeCodeCollector(Collector):
 
     def _get_hook_script(self) -> str:
         """Generate hook script content."""
-        return f'''#!/usr/bin/env python3
+        return _HOOK_SCRIPT_TEMPLATE.format(event_file=self.event_file)
+
+
+# Hook script emitted by setup(); braces are doubled for str.format
+_HOOK_SCRIPT_TEMPLATE = '''#!/usr/bin/env python3
 """Claude Code hook script for Sayu."""
 
 import json
+import mmap
 import os
+import re
+import ssl
 import sys
-import subprocess
+import urllib.error
+import urllib.request
 from datetime import datetime
 from pathlib import Path
 
-def summarize_with_gemini(text, prompt_type="default", context=None):
-    """Summarize text using Gemini API."""
-    if not text:
-        return text
+GEMINI_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash-exp:generateContent"
 
-    # Always try to summarize, even for short text
-    # Create more specific prompts based on context
-    if context and context.get("tool_name"):
-        tool = context["tool_name"]
-        if tool == "Bash":
-            command = context.get("command", text)
-            prompt = f"""다음 bash 명령어가 수행하는 작업을 한국어로 구체적으로 설명해주세요.
+_ssl_context = None
+
+# Verbose tracing is opt-in; errors are always recorded
+DEBUG = bool(os.environ.get("SAYU_DEBUG"))
+LOG_FILE = Path.home() / ".sayu" / "hooks" / "debug.log"
+
+_log_buffer = []
+
+def log_debug(message):
+    """Buffer a trace message when SAYU_DEBUG is set."""
+    if DEBUG:
+        _log_buffer.append(message + "\\n")
+
+def log_error(message):
+    """Buffer an error message."""
+    _log_buffer.append(message + "\\n")
+
+def flush_log():
+    """Write buffered log messages with a single append."""
+    if not _log_buffer:
+        return
+    LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(LOG_FILE, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, "".join(_log_buffer).encode("utf-8", errors="replace"))
+    finally:
+        os.close(fd)
+    _log_buffer.clear()
+
+def post_json(url, payload, timeout=10):
+    """POST a JSON payload in-process and return the decoded JSON response."""
+    global _ssl_context
+    if _ssl_context is None:
+        _ssl_context = ssl.create_default_context()
+
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(payload).encode("utf-8"),
+        headers={{"Content-Type": "application/json"}},
+        method="POST",
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout, context=_ssl_context) as response:
+            return json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        # API errors carry a JSON body describing the failure
+        return json.loads(e.read())
+
+# Prompt templates, rendered with str.format_map; precision specs truncate
+TOOL_PROMPTS = {{
+    "Bash": """다음 bash 명령어가 수행하는 작업을 한국어로 구체적으로 설명해주세요.
 명령어의 목적, 대상, 예상 결과를 포함해서 설명하되, 2-3문장으로 작성해주세요:
-명령어: {{command[:500]}}
-응답 형식: [목적] ... [대상] ... [결과] ..."""
-        elif tool == "Edit":
-            file_name = Path(context.get("file_path", "")).name
-            old_str = context.get("old_string", "")[:200]
-            new_str = context.get("new_string", "")[:200]
-            prompt = f"""{{file_name}} 파일 수정 내용을 한국어로 구체적으로 설명해주세요.
+명령어: {{command:.500}}
+응답 형식: [목적] ... [대상] ... [결과] ...""",
+    "Edit": """{{file_name}} 파일 수정 내용을 한국어로 구체적으로 설명해주세요.
 어떤 코드/내용이 어떻게 변경되었는지, 변경 이유가 무엇인지 2-3문장으로 설명해주세요:
-변경 전: {{old_str}}
-변경 후: {{new_str}}
-응답 형식: [변경내용] ... [변경이유] ..."""
-        elif tool == "Read":
-            file_name = Path(context.get("file_path", "")).name
-            prompt = f"""{{file_name}} 파일을 읽는 목적과 맥락을 한국어로 구체적으로 설명해주세요.
+변경 전: {{old_string:.200}}
+변경 후: {{new_string:.200}}
+응답 형식: [변경내용] ... [변경이유] ...""",
+    "Read": """{{file_name}} 파일을 읽는 목적과 맥락을 한국어로 구체적으로 설명해주세요.
 무엇을 확인하거나 분석하려는지, 어떤 정보를 찾고 있는지 2-3문장으로 설명해주세요:
 파일: {{file_name}}
-내용 일부: {{text[:300]}}
-응답 형식: [목적] ... [찾는 정보] ..."""
-        elif tool == "Grep":
-            pattern = context.get("pattern", "")
-            path = context.get("path", "")
-            prompt = f"""다음 검색 작업의 목적과 맥락을 한국어로 구체적으로 설명해주세요.
+내용 일부: {{text:.300}}
+응답 형식: [목적] ... [찾는 정보] ...""",
+    "Grep": """다음 검색 작업의 목적과 맥락을 한국어로 구체적으로 설명해주세요.
 무엇을 찾고 있는지, 왜 이 패턴으로 검색하는지 2-3문장으로 설명해주세요:
 검색 패턴: {{pattern}}
 검색 위치: {{path}}
-응답 형식: [검색 목적] ... [찾으려는 것] ..."""
-        else:
-            prompt = f"""이 작업의 목적과 맥락을 한국어로 구체적으로 설명해주세요.
+응답 형식: [검색 목적] ... [찾으려는 것] ...""",
+}}
+
+DEFAULT_TOOL_PROMPT = """이 작업의 목적과 맥락을 한국어로 구체적으로 설명해주세요.
 무엇을 하려는지, 왜 이 작업이 필요한지 2-3문장으로 설명해주세요:
-작업 내용: {{text[:500]}}"""
-    else:
-        prompts = {{
-            "user": """사용자의 요청 내용을 한국어로 구체적으로 요약해주세요.
+작업 내용: {{text:.500}}"""
+
+PROMPTS = {{
+    "user": """사용자의 요청 내용을 한국어로 구체적으로 요약해주세요.
 사용자가 무엇을 원하는지, 어떤 문제를 해결하려는지 2-3문장으로 설명해주세요:
 요청: """,
-            "assistant": """어시스턴트의 응답 내용을 한국어로 구체적으로 요약해주세요.
+    "assistant": """어시스턴트의 응답 내용을 한국어로 구체적으로 요약해주세요.
 어떤 해결책을 제시했는지, 무엇을 수행했는지 2-3문장으로 설명해주세요:
 응답: """,
-            "tool": """도구 사용 목적과 결과를 한국어로 구체적으로 설명해주세요.
+    "tool": """도구 사용 목적과 결과를 한국어로 구체적으로 설명해주세요.
 왜 이 도구를 사용했는지, 어떤 결과를 얻었는지 2-3문장으로 설명해주세요:
 내용: """,
-            "default": """다음 내용을 한국어로 구체적으로 요약해주세요.
+    "default": """다음 내용을 한국어로 구체적으로 요약해주세요.
 핵심 내용과 맥락을 2-3문장으로 설명해주세요:
 내용: """
-        }}
-        prompt = prompts.get(prompt_type, prompts["default"]) + text[:500]
+}}
+
+class PromptFields(dict):
+    """Template fields that render missing keys as empty strings."""
+
+    def __missing__(self, key):
+        return ""
+
+def build_prompt(text, prompt_type="default", context=None):
+    """Build the Gemini prompt for a piece of hook content."""
+    if context and context.get("tool_name"):
+        template = TOOL_PROMPTS.get(context["tool_name"], DEFAULT_TOOL_PROMPT)
+        fields = PromptFields(context)
+        fields["text"] = text
+        fields.setdefault("command", text)
+        fields["file_name"] = Path(context.get("file_path", "")).name
+        return template.format_map(fields)
+    return PROMPTS.get(prompt_type, PROMPTS["default"]) + text[:500]
+
+def summarize_with_gemini(text, prompt_type="default", context=None):
+    """Summarize text using Gemini API."""
+    if not text:
+        return text
 
     # Try Gemini 2.0-flash API
     gemini_api_key = os.environ.get("SAYU_GEMINI_API_KEY", "")
     if gemini_api_key:
         try:
+            # Always try to summarize, even for short text
+            prompt = build_prompt(text, prompt_type, context)
+
             # Create JSON payload for Gemini API
-            import json as json_module
             payload = {{
                 "contents": [{{
                     "parts": [{{"text": prompt}}]
@@ -250,35 +470,16 @@ def summarize_with_gemini(text, prompt_type="default", context=None):
                 }}
             }}
 
-            # Call Gemini API using curl with 2.0-flash model
-            cmd = [
-                "curl", "-s",
-                "-X", "POST",
-                f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash-exp:generateContent?key={{gemini_api_key}}",
-                "-H", "Content-Type: application/json",
-                "-d", json_module.dumps(payload)
-            ]
-
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-
-            if result.returncode == 0 and result.stdout:
-                response = json_module.loads(result.stdout)
-                if "candidates" in response and response["candidates"]:
-                    content = response["candidates"][0]["content"]["parts"][0]["text"]
-                    return content.strip()
-                elif "error" in response:
-                    debug_log = Path.home() / ".sayu" / "hooks" / "debug.log"
-                    with open(debug_log, "a") as f:
-                        f.write(f"Gemini API error: {{response.get('error')}}\\n")
+            # Call Gemini API in-process with 2.0-flash model
+            response = post_json(f"{{GEMINI_URL}}?key={{gemini_api_key}}", payload)
+
+            if "candidates" in response and response["candidates"]:
+                content = response["candidates"][0]["content"]["parts"][0]["text"]
+                return content.strip()
+            elif "error" in response:
+                log_error(f"Gemini API error: {{response.get('error')}}")
         except Exception as e:
-            debug_log = Path.home() / ".sayu" / "hooks" / "debug.log"
-            with open(debug_log, "a") as f:
-                f.write(f"Gemini summarization error: {{e}}\\n")
+            log_error(f"Gemini summarization error: {{e}}")
 
     # If Gemini fails, return original text with prefix
     # This preserves the original content for later processing
@@ -288,168 +489,263 @@ def summarize_with_gemini(text, prompt_type="default", context=None):
 
     return text[:200] + "..." if len(text) > 200 else text
 
+TOOL_PREFIXES = {{
+    "Bash": "[명령]",
+    "Edit": "[편집]",
+    "Read": "[읽기]",
+    "Write": "[작성]",
+    "Grep": "[검색]",
+    "MultiEdit": "[다중편집]",
+    "Glob": "[파일검색]",
+    "LS": "[목록]",
+    "Task": "[작업]",
+    "TodoWrite": "[할일]",
+    "WebFetch": "[웹조회]"
+}}
+
 def get_tool_prefix(tool_name):
     """Get Korean prefix for tool type."""
-    prefixes = {{
-        "Bash": "[명령]",
-        "Edit": "[편집]",
-        "Read": "[읽기]",
-        "Write": "[작성]",
-        "Grep": "[검색]",
-        "MultiEdit": "[다중편집]",
-        "Glob": "[파일검색]",
-        "LS": "[목록]",
-        "Task": "[작업]",
-        "TodoWrite": "[할일]",
-        "WebFetch": "[웹조회]"
-    }}
-    return prefixes.get(tool_name, f"[{{tool_name}}]")
+    return TOOL_PREFIXES.get(tool_name, f"[{{tool_name}}]")
+
+# Find the command families a Bash invocation mentions in a single pass
+BASH_COMMAND_RE = re.compile(r"\\b(git|npm|yarn|sayu|ls|rm|mv|cp|echo|grep|rg)\\b")
+
+def _summarize_git_command(command):
+    if "commit" in command:
+        msg = command.split("-m")[-1].strip() if "-m" in command else ""
+        return f"Git 커밋을 생성하여 변경사항을 저장합니다. {{f'커밋 메시지: {{msg[:50]}}' if msg else '변경된 파일들을 버전 관리 시스템에 기록합니다.'}}"
+    elif "status" in command:
+        return "Git 저장소의 현재 상태를 확인합니다. 변경된 파일, 스테이징된 파일, 추적되지 않는 파일들을 파악하여 작업 상황을 점검합니다."
+    elif "diff" in command:
+        return "Git 변경사항을 상세히 확인합니다. 코드의 추가, 삭제, 수정 내용을 라인 단위로 검토하여 정확한 변경 내역을 파악합니다."
+    elif "log" in command:
+        return "Git 커밋 히스토리를 조회합니다. 이전 작업 내역과 커밋 메시지를 확인하여 프로젝트의 변경 이력을 추적합니다."
+    return None
+
+def _summarize_npm_command(command):
+    if "install" in command:
+        pkg = command.split()[-1] if len(command.split()) > 2 else ""
+        return f"NPM 패키지를 설치합니다. {{f'{{pkg}} 패키지를 프로젝트에 추가하여' if pkg and pkg != 'install' else '프로젝트의 의존성 패키지들을 설치하여'}} 개발 환경을 구성합니다."
+    elif "run" in command:
+        script = command.split("run")[-1].strip()
+        return f"NPM 스크립트를 실행합니다. {{f'{{script}} 작업을 수행하여' if script else '정의된 작업을 실행하여'}} 빌드, 테스트, 또는 개발 서버를 동작시킵니다."
+    elif "test" in command:
+        return "테스트 스위트를 실행합니다. 작성된 테스트 케이스들을 실행하여 코드의 정확성과 안정성을 검증합니다."
+    return None
+
+def _summarize_sayu_command(command):
+    if "collect" in command:
+        return "Sayu 이벤트 수집을 시작합니다. AI 대화 기록과 작업 내역을 수집하여 데이터베이스에 저장하고 나중에 활용할 수 있도록 준비합니다."
+    elif "timeline" in command:
+        opts = "-v" if "-v" in command else ""
+        return f"Sayu 타임라인을 확인합니다. 수집된 이벤트들을 시간순으로 정렬하여 {{f'상세한 내용과 함께' if opts else '요약된 형태로'}} 작업 흐름을 시각화합니다."
+    return None
+
+def _summarize_ls_command(command):
+    path = command.split()[-1] if len(command.split()) > 1 else "현재"
+    return f"{{path}} 디렉토리의 내용을 확인합니다. 파일과 폴더 목록을 조회하여 프로젝트 구조를 파악하고 필요한 파일을 찾습니다."
+
+def _summarize_rm_command(command):
+    target = command.split()[-1] if len(command.split()) > 1 else "파일"
+    return f"{{target}}을(를) 삭제합니다. 더 이상 필요하지 않은 파일이나 디렉토리를 제거하여 프로젝트를 정리합니다."
+
+def _summarize_mv_command(command):
+    parts = command.split()
+    return f"파일 또는 디렉토리를 이동합니다. {{f'{{parts[1]}}을(를) {{parts[2]}}로' if len(parts) > 2 else '파일을 새로운 위치로'}} 옮겨 프로젝트 구조를 재구성합니다."
+
+def _summarize_cp_command(command):
+    return "파일 또는 디렉토리를 복사합니다. 백업을 생성하거나 유사한 파일을 만들기 위해 기존 파일의 복제본을 생성합니다."
+
+def _summarize_echo_command(command):
+    return "텍스트를 출력하거나 파일에 기록합니다. 디버깅 메시지를 표시하거나 설정 파일에 내용을 추가하는 작업을 수행합니다."
+
+def _summarize_grep_command(command):
+    pattern = command.split()[1] if len(command.split()) > 1 else "패턴"
+    return f"{{pattern}} 패턴을 검색합니다. 파일 내용에서 특정 텍스트나 패턴을 찾아 코드의 위치를 파악하고 분석합니다."
+
+# Checked in this order when a command mentions several families,
+# e.g. "rm -rf x && git commit" is summarized as a git commit
+BASH_COMMAND_HANDLERS = {{
+    "git": _summarize_git_command,
+    "npm": _summarize_npm_command,
+    "yarn": _summarize_npm_command,
+    "sayu": _summarize_sayu_command,
+    "ls": _summarize_ls_command,
+    "rm": _summarize_rm_command,
+    "mv": _summarize_mv_command,
+    "cp": _summarize_cp_command,
+    "echo": _summarize_echo_command,
+    "grep": _summarize_grep_command,
+    "rg": _summarize_grep_command,
+}}
+
+def _summarize_bash(text, context):
+    command = context.get("command", text)
+    families = {{match.group(1) for match in BASH_COMMAND_RE.finditer(command)}}
+    if families:
+        family = next(name for name in BASH_COMMAND_HANDLERS if name in families)
+        summary = BASH_COMMAND_HANDLERS[family](command)
+        if summary:
+            return summary
+    return f"명령을 실행합니다: {{command[:50]}}. 시스템 작업을 수행하여 필요한 결과를 얻거나 환경을 설정합니다."
+
+def _summarize_edit(text, context):
+    file_name = Path(context.get("file_path", "")).name
+    old_str = context.get("old_string", "")
+    new_str = context.get("new_string", "")
+
+    if "def " in old_str or "def " in new_str:
+        func_name = old_str.split("def ")[-1].split("(")[0] if "def " in old_str else new_str.split("def ")[-1].split("(")[0]
+        return f"{{file_name}} 파일의 {{func_name}} 함수를 수정합니다. 함수의 로직을 개선하거나 새로운 기능을 추가하여 코드의 동작을 변경합니다."
+    elif "class " in old_str or "class " in new_str:
+        class_name = old_str.split("class ")[-1].split(":")[0] if "class " in old_str else new_str.split("class ")[-1].split(":")[0]
+        return f"{{file_name}} 파일의 {{class_name}} 클래스를 수정합니다. 클래스 구조나 메서드를 변경하여 객체의 동작을 개선합니다."
+    elif "import " in old_str or "import " in new_str:
+        return f"{{file_name}} 파일의 import 문을 수정합니다. 필요한 모듈을 추가하거나 불필요한 의존성을 제거하여 코드 구조를 정리합니다."
+    elif "hook" in file_name.lower():
+        return f"훅 스크립트를 개선합니다. 이벤트 처리 로직을 향상시켜 더 정확하고 유용한 정보를 수집하도록 기능을 강화합니다."
+    elif "prompt" in old_str.lower() or "prompt" in new_str.lower():
+        return f"{{file_name}} 파일의 프롬프트를 개선합니다. 더 명확하고 상세한 지시사항을 제공하여 AI의 응답 품질을 향상시킵니다."
+    return f"{{file_name}} 파일을 수정합니다. 코드나 설정을 변경하여 기능을 개선하거나 버그를 수정합니다."
+
+def _summarize_read(text, context):
+    file_name = Path(context.get("file_path", "")).name
+    if "README" in file_name:
+        return "프로젝트 문서를 확인합니다. README 파일을 읽어 프로젝트의 개요, 사용법, 설치 방법 등 중요한 정보를 파악합니다."
+    elif ".py" in file_name:
+        return f"{{file_name}} Python 코드를 분석합니다. 함수, 클래스, 변수들의 구조와 로직을 파악하여 코드의 동작 방식을 이해합니다."
+    elif ".json" in file_name:
+        return f"{{file_name}} 설정 파일을 확인합니다. JSON 형식의 구성 정보를 읽어 시스템이나 애플리케이션의 설정 상태를 파악합니다."
+    elif ".log" in file_name:
+        return f"{{file_name}} 로그 파일을 확인합니다. 시스템이나 애플리케이션의 실행 기록을 분석하여 오류나 동작 패턴을 파악합니다."
+    elif ".md" in file_name:
+        return f"{{file_name}} 마크다운 문서를 읽습니다. 프로젝트 문서나 가이드를 확인하여 필요한 정보를 수집합니다."
+    elif ".txt" in file_name:
+        return f"{{file_name}} 텍스트 파일을 읽습니다. 저장된 정보나 데이터를 확인하여 작업에 필요한 내용을 파악합니다."
+    return f"{{file_name}} 파일을 읽습니다. 파일의 내용을 확인하여 필요한 정보를 수집하고 다음 작업을 준비합니다."
+
+def _summarize_grep(text, context):
+    pattern = context.get("pattern", "")
+    path = context.get("path", "")
+    return f"'{{pattern}}' 패턴을 {{path}}에서 검색합니다. 코드베이스 전체에서 특정 함수, 변수, 또는 텍스트의 위치를 찾아 관련 코드를 분석할 수 있도록 준비합니다."
+
+def _summarize_write(text, context):
+    file_name = Path(context.get("file_path", "")).name
+    return f"{{file_name}} 파일을 생성하거나 덮어씁니다. 새로운 코드나 설정을 작성하여 프로젝트에 필요한 파일을 만들거나 기존 파일을 완전히 재작성합니다."
+
+def _summarize_multi_edit(text, context):
+    file_name = Path(context.get("file_path", "")).name
+    edits = context.get("edits", [])
+    return f"{{file_name}} 파일에 {{len(edits)}}개의 수정 사항을 적용합니다. 여러 부분을 동시에 변경하여 코드를 효율적으로 리팩토링하거나 기능을 개선합니다."
+
+def _summarize_glob(text, context):
+    pattern = context.get("pattern", "")
+    return f"'{{pattern}}' 패턴으로 파일을 검색합니다. 프로젝트 내에서 특정 유형이나 이름의 파일들을 찾아 작업 대상을 파악합니다."
+
+def _summarize_ls(text, context):
+    path = context.get("path", "")
+    return f"{{path}} 디렉토리의 내용을 나열합니다. 파일과 폴더 구조를 확인하여 프로젝트 구성을 파악합니다."
+
+def _summarize_web_fetch(text, context):
+    url = context.get("url", "")
+    return f"{{url}} 웹 페이지의 내용을 가져옵니다. 온라인 문서나 API 정보를 조회하여 필요한 참고 자료를 수집합니다."
+
+def _summarize_task(text, context):
+    description = context.get("description", "")
+    return f"작업을 실행합니다: {{description}}. 복잡한 작업을 자동화하거나 여러 단계의 프로세스를 수행합니다."
+
+MANUAL_SUMMARY_HANDLERS = {{
+    "Bash": _summarize_bash,
+    "Edit": _summarize_edit,
+    "Read": _summarize_read,
+    "Grep": _summarize_grep,
+    "Write": _summarize_write,
+    "MultiEdit": _summarize_multi_edit,
+    "Glob": _summarize_glob,
+    "LS": _summarize_ls,
+    "WebFetch": _summarize_web_fetch,
+    "Task": _summarize_task,
+}}
 
 def create_manual_summary(text, context):
     """Create manual summary when Gemini is not available."""
-    tool = context.get("tool_name", "")
-
-    if tool == "Bash":
-        command = context.get("command", text)
-        if "git" in command:
-            if "commit" in command:
-                msg = command.split("-m")[-1].strip() if "-m" in command else ""
-                return f"Git 커밋을 생성하여 변경사항을 저장합니다. {{f'커밋 메시지: {{msg[:50]}}' if msg else '변경된 파일들을 버전 관리 시스템에 기록합니다.'}}"
-            elif "status" in command:
-                return "Git 저장소의 현재 상태를 확인합니다. 변경된 파일, 스테이징된 파일, 추적되지 않는 파일들을 파악하여 작업 상황을 점검합니다."
-            elif "diff" in command:
-                return "Git 변경사항을 상세히 확인합니다. 코드의 추가, 삭제, 수정 내용을 라인 단위로 검토하여 정확한 변경 내역을 파악합니다."
-            elif "log" in command:
-                return "Git 커밋 히스토리를 조회합니다. 이전 작업 내역과 커밋 메시지를 확인하여 프로젝트의 변경 이력을 추적합니다."
-        elif "npm" in command or "yarn" in command:
-            if "install" in command:
-                pkg = command.split()[-1] if len(command.split()) > 2 else ""
-                return f"NPM 패키지를 설치합니다. {{f'{{pkg}} 패키지를 프로젝트에 추가하여' if pkg and pkg != 'install' else '프로젝트의 의존성 패키지들을 설치하여'}} 개발 환경을 구성합니다."
-            elif "run" in command:
-                script = command.split("run")[-1].strip() if "run" in command else ""
-                return f"NPM 스크립트를 실행합니다. {{f'{{script}} 작업을 수행하여' if script else '정의된 작업을 실행하여'}} 빌드, 테스트, 또는 개발 서버를 동작시킵니다."
-            elif "test" in command:
-                return "테스트 스위트를 실행합니다. 작성된 테스트 케이스들을 실행하여 코드의 정확성과 안정성을 검증합니다."
-        elif "sayu" in command:
-            if "collect" in command:
-                return "Sayu 이벤트 수집을 시작합니다. AI 대화 기록과 작업 내역을 수집하여 데이터베이스에 저장하고 나중에 활용할 수 있도록 준비합니다."
-            elif "timeline" in command:
-                opts = "-v" if "-v" in command else ""
-                return f"Sayu 타임라인을 확인합니다. 수집된 이벤트들을 시간순으로 정렬하여 {{f'상세한 내용과 함께' if opts else '요약된 형태로'}} 작업 흐름을 시각화합니다."
-        elif "ls" in command:
-            path = command.split()[-1] if len(command.split()) > 1 else "현재"
-            return f"{{path}} 디렉토리의 내용을 확인합니다. 파일과 폴더 목록을 조회하여 프로젝트 구조를 파악하고 필요한 파일을 찾습니다."
-        elif "rm" in command:
-            target = command.split()[-1] if len(command.split()) > 1 else "파일"
-            return f"{{target}}을(를) 삭제합니다. 더 이상 필요하지 않은 파일이나 디렉토리를 제거하여 프로젝트를 정리합니다."
-        elif "mv" in command:
-            parts = command.split()
-            return f"파일 또는 디렉토리를 이동합니다. {{f'{{parts[1]}}을(를) {{parts[2]}}로' if len(parts) > 2 else '파일을 새로운 위치로'}} 옮겨 프로젝트 구조를 재구성합니다."
-        elif "cp" in command:
-            return "파일 또는 디렉토리를 복사합니다. 백업을 생성하거나 유사한 파일을 만들기 위해 기존 파일의 복제본을 생성합니다."
-        elif "echo" in command:
-            return "텍스트를 출력하거나 파일에 기록합니다. 디버깅 메시지를 표시하거나 설정 파일에 내용을 추가하는 작업을 수행합니다."
-        elif "grep" in command or "rg" in command:
-            pattern = command.split()[1] if len(command.split()) > 1 else "패턴"
-            return f"{{pattern}} 패턴을 검색합니다. 파일 내용에서 특정 텍스트나 패턴을 찾아 코드의 위치를 파악하고 분석합니다."
-        return f"명령을 실행합니다: {{command[:50]}}. 시스템 작업을 수행하여 필요한 결과를 얻거나 환경을 설정합니다."
-
-    elif tool == "Edit":
-        file_name = Path(context.get("file_path", "")).name
-        old_str = context.get("old_string", "")
-        new_str = context.get("new_string", "")
-
-        if "def " in old_str or "def " in new_str:
-            func_name = old_str.split("def ")[-1].split("(")[0] if "def " in old_str else new_str.split("def ")[-1].split("(")[0]
-            return f"{{file_name}} 파일의 {{func_name}} 함수를 수정합니다. 함수의 로직을 개선하거나 새로운 기능을 추가하여 코드의 동작을 변경합니다."
-        elif "class " in old_str or "class " in new_str:
-            class_name = old_str.split("class ")[-1].split(":")[0] if "class " in old_str else new_str.split("class ")[-1].split(":")[0]
-            return f"{{file_name}} 파일의 {{class_name}} 클래스를 수정합니다. 클래스 구조나 메서드를 변경하여 객체의 동작을 개선합니다."
-        elif "import " in old_str or "import " in new_str:
-            return f"{{file_name}} 파일의 import 문을 수정합니다. 필요한 모듈을 추가하거나 불필요한 의존성을 제거하여 코드 구조를 정리합니다."
-        elif "hook" in file_name.lower():
-            return f"훅 스크립트를 개선합니다. 이벤트 처리 로직을 향상시켜 더 정확하고 유용한 정보를 수집하도록 기능을 강화합니다."
-        elif "prompt" in old_str.lower() or "prompt" in new_str.lower():
-            return f"{{file_name}} 파일의 프롬프트를 개선합니다. 더 명확하고 상세한 지시사항을 제공하여 AI의 응답 품질을 향상시킵니다."
-        return f"{{file_name}} 파일을 수정합니다. 코드나 설정을 변경하여 기능을 개선하거나 버그를 수정합니다."
-
-    elif tool == "Read":
-        file_name = Path(context.get("file_path", "")).name
-        if "README" in file_name:
-            return "프로젝트 문서를 확인합니다. README 파일을 읽어 프로젝트의 개요, 사용법, 설치 방법 등 중요한 정보를 파악합니다."
-        elif ".py" in file_name:
-            return f"{{file_name}} Python 코드를 분석합니다. 함수, 클래스, 변수들의 구조와 로직을 파악하여 코드의 동작 방식을 이해합니다."
-        elif ".json" in file_name:
-            return f"{{file_name}} 설정 파일을 확인합니다. JSON 형식의 구성 정보를 읽어 시스템이나 애플리케이션의 설정 상태를 파악합니다."
-        elif ".log" in file_name:
-            return f"{{file_name}} 로그 파일을 확인합니다. 시스템이나 애플리케이션의 실행 기록을 분석하여 오류나 동작 패턴을 파악합니다."
-        elif ".md" in file_name:
-            return f"{{file_name}} 마크다운 문서를 읽습니다. 프로젝트 문서나 가이드를 확인하여 필요한 정보를 수집합니다."
-        elif ".txt" in file_name:
-            return f"{{file_name}} 텍스트 파일을 읽습니다. 저장된 정보나 데이터를 확인하여 작업에 필요한 내용을 파악합니다."
-        return f"{{file_name}} 파일을 읽습니다. 파일의 내용을 확인하여 필요한 정보를 수집하고 다음 작업을 준비합니다."
-
-    elif tool == "Grep":
-        pattern = context.get("pattern", "")
-        path = context.get("path", "")
-        return f"'{{pattern}}' 패턴을 {{path}}에서 검색합니다. 코드베이스 전체에서 특정 함수, 변수, 또는 텍스트의 위치를 찾아 관련 코드를 분석할 수 있도록 준비합니다."
-
-    elif tool == "Write":
-        file_name = Path(context.get("file_path", "")).name
-        return f"{{file_name}} 파일을 생성하거나 덮어씁니다. 새로운 코드나 설정을 작성하여 프로젝트에 필요한 파일을 만들거나 기존 파일을 완전히 재작성합니다."
-
-    elif tool == "MultiEdit":
-        file_name = Path(context.get("file_path", "")).name
-        edits = context.get("edits", [])
-        return f"{{file_name}} 파일에 {{len(edits)}}개의 수정 사항을 적용합니다. 여러 부분을 동시에 변경하여 코드를 효율적으로 리팩토링하거나 기능을 개선합니다."
-
-    elif tool == "Glob":
-        pattern = context.get("pattern", "")
-        return f"'{{pattern}}' 패턴으로 파일을 검색합니다. 프로젝트 내에서 특정 유형이나 이름의 파일들을 찾아 작업 대상을 파악합니다."
-
-    elif tool == "LS":
-        path = context.get("path", "")
-        return f"{{path}} 디렉토리의 내용을 나열합니다. 파일과 폴더 구조를 확인하여 프로젝트 구성을 파악합니다."
-
-    elif tool == "WebFetch":
-        url = context.get("url", "")
-        return f"{{url}} 웹 페이지의 내용을 가져옵니다. 온라인 문서나 API 정보를 조회하여 필요한 참고 자료를 수집합니다."
-
-    elif tool == "Task":
-        description = context.get("description", "")
-        return f"작업을 실행합니다: {{description}}. 복잡한 작업을 자동화하거나 여러 단계의 프로세스를 수행합니다."
+    handler = MANUAL_SUMMARY_HANDLERS.get(context.get("tool_name", ""))
+    if handler:
+        return handler(text, context)
 
     return text[:200] + "..." if len(text) > 200 else text
 
+def iter_lines_reversed(path):
+    """Yield lines of a file from last to first via a read-only memory map."""
+    with open(path, "rb") as f:
+        # Empty files cannot be mapped
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            end = len(mm)
+            while end > 0:
+                start = mm.rfind(b"\\n", 0, end) + 1
+                yield mm[start:end]
+                end = start - 1
+
+# Hook events whose content is summarized with Gemini
+ASYNC_SUMMARY_EVENTS = ("PostToolUse", "UserPromptSubmit", "Stop")
+
+def detach():
+    """
+    Fork into the background so the hook returns to Claude Code immediately.
+
+    Returns True in the process that should continue handling the event.
+    """
+    if not hasattr(os, "fork"):
+        return True
+
+    if os.fork() > 0:
+        return False
+
+    # The parent flushes the messages logged so far
+    _log_buffer.clear()
+
+    # Release the hook's stdio so Claude Code does not wait on the child
+    os.setsid()
+    devnull = os.open(os.devnull, os.O_RDWR)
+    for fd in (0, 1, 2):
+        os.dup2(devnull, fd)
+    return True
+
 def main():
     # Log execution
-    log_file = Path.home() / ".sayu" / "hooks" / "debug.log"
-    log_file.parent.mkdir(parents=True, exist_ok=True)
-    with open(log_file, "a") as f:
-        f.write(f"\\n[{{datetime.now()}}] Hook script executed\\n")
+    log_debug(f"\\n[{{datetime.now()}}] Hook script executed")
 
     # Read hook data from stdin
     try:
         input_data = sys.stdin.read()
-        with open(log_file, "a") as f:
-            f.write(f"Input data: {{input_data[:200]}}\\n")
+        log_debug(f"Input data: {{input_data[:200]}}")
         hook_data = json.loads(input_data)
     except Exception as e:
-        with open(log_file, "a") as f:
-            f.write(f"Error parsing JSON: {{e}}\\n")
+        log_error(f"Error parsing JSON: {{e}}")
         return
 
     # Extract hook event type
     hook_event = hook_data.get("hook_event_name", "")
 
     # Log the actual hook event for debugging
-    with open(log_file, "a") as f:
-        f.write(f"Hook event: {{hook_event}}\\n")
-        f.write(f"Available keys: {{list(hook_data.keys())}}\\n")
+    log_debug(f"Hook event: {{hook_event}}")
+    log_debug(f"Available keys: {{list(hook_data.keys())}}")
+
+    # Stamp the event when the hook fires, before any background summary
+    # delays it past events that happened later
+    received_at = datetime.now().isoformat()
+
+    # Summarizing with Gemini can take seconds; finish in the background so
+    # Claude Code is not blocked waiting on the API
+    if hook_event in ASYNC_SUMMARY_EVENTS and os.environ.get("SAYU_GEMINI_API_KEY"):
+        if not detach():
+            return
 
     # Create event based on hook type
     event = {{
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": received_at,
         "hook_event": hook_event,
         "session_id": hook_data.get("session_id", ""),
         "cwd": hook_data.get("cwd", "")
@@ -639,36 +935,33 @@ def main():
 
         if transcript_path and Path(transcript_path).exists():
             try:
-                with open(transcript_path, "r") as f:
-                    lines = f.readlines()
-                    # Collect all assistant messages from the last exchange
-                    assistant_messages = []
-                    in_last_exchange = False
-
-                    # Read from end to find the last assistant response(s)
-                    for line in reversed(lines):
-                        if line.strip():
-                            data = json.loads(line)
-                            role = data.get("role", "")
-
-                            if role == "assistant" and not in_last_exchange:
-                                in_last_exchange = True
-                                assistant_messages.append(data.get("content", ""))
-                            elif role == "assistant" and in_last_exchange:
-                                assistant_messages.append(data.get("content", ""))
-                            elif role == "user" and in_last_exchange:
-                                # Stop when we hit a user message
-                                break
-
-                    # Combine assistant messages and summarize
-                    if assistant_messages:
-                        combined_text = " ".join(reversed(assistant_messages))
-                        summary = summarize_with_gemini(combined_text, "assistant")
-                        content = f"[어시스턴트 응답] {{summary}}"
+                # Collect all assistant messages from the last exchange
+                assistant_messages = []
+                in_last_exchange = False
+
+                # Read from end to find the last assistant response(s)
+                for line in iter_lines_reversed(transcript_path):
+                    if line.strip():
+                        data = json.loads(line)
+                        role = data.get("role", "")
+
+                        if role == "assistant" and not in_last_exchange:
+                            in_last_exchange = True
+                            assistant_messages.append(data.get("content", ""))
+                        elif role == "assistant" and in_last_exchange:
+                            assistant_messages.append(data.get("content", ""))
+                        elif role == "user" and in_last_exchange:
+                            # Stop when we hit a user message
+                            break
+
+                # Combine assistant messages and summarize
+                if assistant_messages:
+                    combined_text = " ".join(reversed(assistant_messages))
+                    summary = summarize_with_gemini(combined_text, "assistant")
+                    content = f"[어시스턴트 응답] {{summary}}"
 
             except Exception as e:
-                with open(log_file, "a") as f:
-                    f.write(f"Error reading transcript: {{e}}\\n")
+                log_error(f"Error reading transcript: {{e}}")
                 content = "[어시스턴트 응답] (읽기 실패)"
 
         metadata = {{"type": "assistant", "hook": "Stop"}}
@@ -704,18 +997,28 @@ def main():
 
     # Create final event in sayu format
     sayu_event = {{
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": received_at,
         "content": content,
         "metadata": metadata
     }}
 
     # Append to events file
-    event_file = Path("{self.event_file}")
+    event_file = Path("{event_file}")
     event_file.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(event_file, "a") as f:
-        f.write(json.dumps(sayu_event) + "\\n")
+    # Write the record with a single O_APPEND write so concurrent hooks
+    # cannot interleave partial lines. Non-ASCII text is stored as raw UTF-8
+    # rather than \\u escapes, roughly halving the size of Korean content.
+    record = json.dumps(sayu_event, ensure_ascii=False) + "\\n"
+    fd = os.open(event_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, record.encode("utf-8", errors="replace"))
+    finally:
+        os.close(fd)
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        flush_log()
 '''
@@ -1,12 +1,152 @@
 """Git event collector for tracking commits, checkouts, and other git operations."""
 
+import functools
+import itertools
+import os
+import shutil
 import subprocess
+import threading
+from collections.abc import Iterator, Sequence
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, NamedTuple
 
 from ..core import Collector, Event, EventType
 
+# Git hooks that trigger event collection
+_HOOK_NAMES = ("post-commit", "post-checkout", "post-merge")
+
+# git log/reflog invocations; fields are separated by the ASCII unit
+# separator so commit subjects cannot collide with it
+_LOG_ARGV = ("git", "log", "--pretty=tformat:%H%x1f%P%x1f%an%x1f%ae%x1f%at%x1f%s")
+_REFLOG_ARGV = (
+    "git",
+    "log",
+    "--walk-reflogs",
+    "--grep-reflog=checkout: moving from ",
+    "--fixed-strings",
+    "--pretty=format:%H%x1f%gd%x1f%gs%x1f%at",
+    "--date=iso",  # Keeps %gd in its HEAD@{<date>} form
+)
+
+# Shared script the hooks above are symlinked to
+_HOOK_SCRIPT = "sayu-hook"
+
+
+class _Commit(NamedTuple):
+    """A commit parsed from git log output."""
+
+    hash: str
+    parents: list[str]
+    author: str
+    email: str
+    date: str
+    message: str
+
+
+class _Checkout(NamedTuple):
+    """A checkout entry parsed from the reflog."""
+
+    hash: str
+    ref: str
+    message: str
+    date: str
+
+
+def _resolve_git_dir(dot_git: Path) -> Path:
+    """Follow a .git file (worktrees, submodules) to the real git directory."""
+    try:
+        content = dot_git.read_text()
+    except OSError:
+        # A regular .git directory, or no repository at all
+        return dot_git
+    if content.startswith("gitdir: "):
+        return dot_git.parent / content[8:].strip()
+    return dot_git
+
+
+@functools.lru_cache(maxsize=1)
+def _pygit2() -> Any:
+    """Import pygit2 on first use, or return None if it is not installed.
+
+    Deferred because the import costs tens of milliseconds and most sayu
+    commands never walk commits.
+    """
+    try:
+        import pygit2
+    except ImportError:  # Optional; the git CLI is used instead
+        return None
+    return pygit2
+
+
+@functools.lru_cache(maxsize=1)
+def _resolve_sayu_path() -> str:
+    """Find the sayu executable in PATH or the pipx default location."""
+    sayu_path = shutil.which("sayu")
+    if sayu_path:
+        return sayu_path
+
+    # Use pipx default location
+    pipx_path = Path.home() / ".local" / "bin" / "sayu"
+    if pipx_path.exists():
+        return str(pipx_path)
+    return "sayu"  # Fallback to PATH
+
+
+class _GitSession:
+    """Long-running ``git cat-file --batch`` process for repeated object reads."""
+
+    def __init__(self, repo_path: Path):
+        """Start the cat-file process in the given repository."""
+        self.process = subprocess.Popen(
+            ["git", "cat-file", "--batch"],
+            cwd=repo_path,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+
+    def read_object(self, rev: str) -> tuple[str, bytes] | None:
+        """
+        Read an object by revision name.
+
+        Args:
+            rev: Any revision understood by git rev-parse
+
+        Returns:
+            Object type and raw content, or None if the object is missing
+        """
+        if "\n" in rev:
+            return None
+
+        stdin = self.process.stdin
+        stdout = self.process.stdout
+        if stdin is None or stdout is None:
+            return None
+
+        stdin.write(rev.encode() + b"\n")
+        stdin.flush()
+
+        # "<oid> <type> <size>" on success, "<rev> missing" (or "ambiguous")
+        # otherwise
+        header = stdout.readline().rstrip(b"\n")
+        if not header or header.endswith((b" missing", b" ambiguous")):
+            return None
+
+        _, obj_type, size = header.split(b" ")
+        content = stdout.read(int(size))
+        stdout.read(1)  # Trailing newline after the object content
+        return obj_type.decode(), content
+
+    def close(self) -> None:
+        """Stop the cat-file process."""
+        if self.process.stdin:
+            self.process.stdin.close()
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
 
 class GitCollector(Collector):
     """Collects Git events like commits, checkouts, branches, etc."""
@@ -14,13 +154,12 @@ class GitCollector(Collector):
     def __init__(self, repo_path: Path | None = None, commit_range: str | None = None):
         """Initialize Git collector."""
         self.repo_path = repo_path or Path.cwd()
-        self.git_dir = self.repo_path / ".git"
-        self.last_commit_hash = None
+        self.git_dir = _resolve_git_dir(self.repo_path / ".git")
+        self._git_dir_str = str(self.git_dir)
         self.last_branch = None
         self.commit_range = commit_range  # e.g., "HEAD~1..HEAD", "abc123..def456"
-        self.seen_commit_hashes = (
-            set()
-        )  # Track already processed commits to avoid duplicates
+        self._session: _GitSession | None = None
+        self._repository: Any = None
 
     @property
     def name(self) -> str:
@@ -29,92 +168,119 @@ class GitCollector(Collector):
 
     def collect(self, since: datetime | None = None) -> list[Event]:
         """Collect Git events since the given timestamp."""
-        if not self.git_dir.exists():
-            return []
+        return list(itertools.chain.from_iterable(self.collect_batched(since)))
+
+    def collect_batched(
+        self, since: datetime | None = None, batch_size: int = 64
+    ) -> Iterator[list[Event]]:
+        """Collect Git events in batches as git output is parsed.
+
+        Args:
+            since: Only collect events after this timestamp
+            batch_size: Maximum number of events per yielded batch
+
+        Yields:
+            Lists of at most batch_size events
+        """
+        if not os.path.isdir(self._git_dir_str):
+            return
 
         # Make since timezone-naive if it's timezone-aware
         if since and since.tzinfo is not None:
             since = since.replace(tzinfo=None)
 
-        events = []
+        batch = []
         processed_hashes = set()  # Track commits processed in this collection
 
         # Get current branch
         current_branch = self._get_current_branch()
         if current_branch and current_branch != self.last_branch:
-            events.append(self._create_branch_event(current_branch))
+            batch.append(self._create_branch_event(current_branch))
             self.last_branch = current_branch
 
-        # Get recent commits
-        commits = self._get_recent_commits(since)
-        for commit in commits:
-            # Skip if we've already processed this commit
-            if (
-                commit["hash"] in self.seen_commit_hashes
-                or commit["hash"] in processed_hashes
-            ):
+        # Get recent commits and merges from a single git log
+        for commit in self._get_recent_commits(since):
+            # Earlier collections are deduplicated by storage, so only
+            # duplicates within this walk need skipping
+            if commit.hash in processed_hashes:
                 continue
 
             # Skip auto-generated summary commits
-            if "Collecting events since last commit" in commit["message"]:
+            if "Collecting events since last commit" in commit.message:
                 continue
 
-            events.append(self._create_commit_event(commit))
-            processed_hashes.add(commit["hash"])
+            if len(commit.parents) > 1:
+                batch.append(self._create_merge_event(commit))
+            else:
+                batch.append(self._create_commit_event(commit))
+            processed_hashes.add(commit.hash)
+
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
 
         # Get recent checkouts (from reflog)
-        checkouts = self._get_recent_checkouts(since)
-        for checkout in checkouts:
+        for checkout in self._get_recent_checkouts(since):
             # Skip if this is a duplicate checkout for same hash
-            if checkout["hash"] in processed_hashes:
+            if checkout.hash in processed_hashes:
                 continue
-            events.append(self._create_checkout_event(checkout))
-            processed_hashes.add(checkout["hash"])
-
-        # Get recent merges (skip if already in commits)
-        merges = self._get_recent_merges(since)
-        for merge in merges:
-            if merge["hash"] not in processed_hashes:
-                events.append(self._create_merge_event(merge))
-                processed_hashes.add(merge["hash"])
+            batch.append(self._create_checkout_event(checkout))
+            processed_hashes.add(checkout.hash)
 
-        # Update seen commits for next collection
-        self.seen_commit_hashes.update(processed_hashes)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
 
-        return events
+        if batch:
+            yield batch
 
     def setup(self) -> None:
         """Set up Git hooks for automatic event collection."""
-        if not self.git_dir.exists():
+        if not os.path.isdir(self._git_dir_str):
             return
 
-        hooks_dir = self.git_dir / "hooks"
+        hooks_dir = self._get_hooks_dir()
         hooks_dir.mkdir(exist_ok=True)
 
-        # Create post-commit hook
-        self._create_post_commit_hook(hooks_dir)
-
-        # Create post-checkout hook
-        self._create_post_checkout_hook(hooks_dir)
-
-        # Create post-merge hook
-        self._create_post_merge_hook(hooks_dir)
+        self._write_hook_script(hooks_dir)
+        for hook_name in _HOOK_NAMES:
+            self._link_hook(hooks_dir, hook_name)
 
     def teardown(self) -> None:
         """Remove Git hooks."""
-        if not self.git_dir.exists():
+        if not os.path.isdir(self._git_dir_str):
             return
 
-        hooks_dir = self.git_dir / "hooks"
+        self.close()
+
+        hooks_dir = self._get_hooks_dir()
 
-        # Remove hooks
-        for hook_name in ["post-commit", "post-checkout", "post-merge"]:
-            hook_path = hooks_dir / hook_name
-            if hook_path.exists():
-                hook_path.unlink()
+        # Remove hooks and the script they link to
+        for hook_name in (*_HOOK_NAMES, _HOOK_SCRIPT):
+            (hooks_dir / hook_name).unlink(missing_ok=True)
+
+    def _get_hooks_dir(self) -> Path:
+        """Return the hooks directory, which worktrees share with the main repo."""
+        try:
+            common_dir = (self.git_dir / "commondir").read_text().strip()
+        except OSError:
+            return self.git_dir / "hooks"
+        return self.git_dir / common_dir / "hooks"
 
     def _get_current_branch(self) -> str | None:
         """Get current branch name."""
+        # HEAD is a one-line symbolic ref in the common case; reading it
+        # directly avoids starting git at all
+        try:
+            head = (self.git_dir / "HEAD").read_text()
+        except OSError:
+            # No HEAD file to read; let git work out the branch
+            pass
+        else:
+            if head.startswith("ref: refs/heads/"):
+                return head[16:].strip()
+            return None  # Detached HEAD
+
         try:
             result = subprocess.run(
                 ["git", "branch", "--show-current"],
@@ -129,201 +295,186 @@ class GitCollector(Collector):
             pass
         return None
 
+    def close(self) -> None:
+        """Stop the long-running git process, if any."""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
     def _get_last_commit_time(self) -> datetime | None:
         """Get the timestamp of the last commit."""
-        try:
-            result = subprocess.run(
-                ["git", "log", "-1", "--pretty=format:%ad", "--date=iso"],
-                cwd=self.repo_path,
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
-            if result.returncode == 0 and result.stdout.strip():
-                date_str = result.stdout.strip()
-                # Remove timezone info and normalize format
-                if "+" in date_str:
-                    date_str = date_str.split("+")[0].strip()
-                elif date_str.endswith("Z"):
-                    date_str = date_str[:-1].strip()
-                # Replace space with T for ISO format
-                if " " in date_str:
-                    date_str = date_str.replace(" ", "T")
-                return datetime.fromisoformat(date_str)
-        except (subprocess.TimeoutExpired, subprocess.CalledProcessError):
-            pass
-        return None
+        return self._get_commit_time("HEAD")
 
     def _get_commit_time(self, commit_ref: str) -> datetime | None:
         """Get the timestamp of a specific commit."""
+        # Reuse one cat-file process across lookups instead of running
+        # git log for every commit
         try:
-            result = subprocess.run(
-                ["git", "log", "-1", "--pretty=format:%ad", "--date=iso", commit_ref],
-                cwd=self.repo_path,
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
-            if result.returncode == 0 and result.stdout.strip():
-                date_str = result.stdout.strip()
-                # Remove timezone info and normalize format
-                if "+" in date_str:
-                    date_str = date_str.split("+")[0].strip()
-                elif date_str.endswith("Z"):
-                    date_str = date_str[:-1].strip()
-                # Replace space with T for ISO format
-                if " " in date_str:
-                    date_str = date_str.replace(" ", "T")
-                return datetime.fromisoformat(date_str)
-        except (subprocess.TimeoutExpired, subprocess.CalledProcessError):
-            pass
+            if self._session is None:
+                self._session = _GitSession(self.repo_path)
+            obj = self._session.read_object(f"{commit_ref}^{{commit}}")
+        except OSError:
+            self.close()
+            return None
+
+        if obj is None:
+            return None
+
+        for line in obj[1].split(b"\n"):
+            if line.startswith(b"author "):
+                # "author <name> <email> <unix time> <+hhmm>"
+                parts = line.rsplit(b" ", 2)
+                if len(parts) != 3:
+                    return None
+                # Local wall-clock time, matching the collected events
+                return datetime.fromtimestamp(int(parts[1]))
         return None
 
-    def _get_recent_commits(
-        self, since: datetime | None = None
-    ) -> list[dict[str, Any]]:
-        """Get recent commits."""
-        try:
-            # Build git log command
-            cmd = ["git", "log", "--pretty=format:%H|%an|%ae|%ad|%s", "--date=iso"]
+    def _iter_git_lines(self, cmd: Sequence[str], timeout: float = 10) -> Iterator[str]:
+        """Stream the output lines of a git command as they are produced.
+
+        git is killed if it runs past `timeout` seconds, which then raises
+        TimeoutExpired. Raises CalledProcessError once the output is
+        exhausted if git failed.
+        """
+        with subprocess.Popen(
+            cmd,
+            cwd=self.repo_path,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        ) as process:
+            assert process.stdout is not None
+            timed_out = threading.Event()
+
+            def expire() -> None:
+                # Killing git closes its stdout, which unblocks a stalled read
+                timed_out.set()
+                process.kill()
+
+            deadline = threading.Timer(timeout, expire)
+            deadline.start()
+            try:
+                # Read raw bytes and decode per line so a stray non-UTF-8
+                # author name cannot abort the whole walk
+                for raw_line in process.stdout:
+                    raw_line = raw_line.rstrip(b"\n")
+                    if raw_line:
+                        yield raw_line.decode("utf-8", "replace")
+                returncode = process.wait()
+            finally:
+                deadline.cancel()
+                if process.poll() is None:
+                    process.kill()
+
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(cmd, timeout)
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, cmd)
+
+    def _get_recent_commits(self, since: datetime | None = None) -> Iterator[_Commit]:
+        """Stream recent commits, including merges (commits with several parents)."""
+        # Walk in-process with libgit2 when available; explicit ranges use
+        # git's own revision syntax, so they always go through the CLI
+        if not self.commit_range:
+            repository = self._get_repository()
+            if repository is not None:
+                yield from self._walk_commits(repository, since)
+                return
 
+        try:
             # Use commit range if specified
             if self.commit_range:
-                cmd.append(self.commit_range)
+                cmd = (*_LOG_ARGV, self.commit_range)
             elif since:
-                cmd.extend(["--since", since.isoformat()])
+                cmd = (*_LOG_ARGV, "--since", since.isoformat())
             else:
                 # Get last 10 commits if no since date
-                cmd.extend(["-10"])
-
-            result = subprocess.run(
-                cmd, cwd=self.repo_path, capture_output=True, text=True, timeout=10
-            )
-
-            if result.returncode != 0:
-                return []
-
-            commits = []
-            for line in result.stdout.strip().split("\n"):
-                if not line:
-                    continue
-
-                parts = line.split("|", 4)
-                if len(parts) >= 5:
-                    commits.append(
-                        {
-                            "hash": parts[0],
-                            "author": parts[1],
-                            "email": parts[2],
-                            "date": parts[3],
-                            "message": parts[4],
-                        }
+                cmd = (*_LOG_ARGV, "-10")
+
+            for line in self._iter_git_lines(cmd):
+                parts = line.split("\x1f", 5)
+                if len(parts) >= 6:
+                    commit_hash, parents, author, email, date, message = parts
+                    yield _Commit(
+                        commit_hash, parents.split(), author, email, date, message
                     )
 
-            return commits
-
         except (subprocess.TimeoutExpired, subprocess.CalledProcessError):
-            return []
+            pass
 
-    def _get_recent_checkouts(
-        self, since: datetime | None = None
-    ) -> list[dict[str, Any]]:
-        """Get recent checkouts from reflog."""
+    def _get_repository(self) -> Any:
+        """Open the repository with pygit2, or return None if unavailable."""
+        pygit2 = _pygit2()
+        if pygit2 is None:
+            return None
+        if self._repository is None:
+            try:
+                self._repository = pygit2.Repository(self._git_dir_str)
+            except pygit2.GitError:
+                return None
+        return self._repository
+
+    def _walk_commits(
+        self, repository: Any, since: datetime | None = None
+    ) -> Iterator[_Commit]:
+        """Stream recent commits by walking the repository in-process."""
+        pygit2 = _pygit2()
         try:
-            cmd = ["git", "reflog", "--pretty=format:%H|%gd|%gs|%ad", "--date=iso"]
-
-            if since:
-                cmd.extend(["--since", since.isoformat()])
-            else:
-                cmd.extend(["-20"])  # Last 20 reflog entries
-
-            result = subprocess.run(
-                cmd, cwd=self.repo_path, capture_output=True, text=True, timeout=10
+            walker = repository.walk(repository.head.target, pygit2.GIT_SORT_NONE)
+        except pygit2.GitError:
+            return  # Unborn HEAD
+
+        since_time = None
+        limit = None
+        if since:
+            since_time = since.timestamp()
+        else:
+            limit = 10  # Last 10 commits if no since date
+
+        for count, commit in enumerate(walker):
+            if count == limit:
+                break
+            if since_time is not None and commit.commit_time < since_time:
+                break
+
+            # Same subject as git's %s: the first paragraph on one line
+            subject = " ".join(commit.message.split("\n\n", 1)[0].split())
+            yield _Commit(
+                str(commit.id),
+                [str(parent) for parent in commit.parent_ids],
+                commit.author.name,
+                commit.author.email,
+                str(commit.author.time),
+                subject,
             )
 
-            if result.returncode != 0:
-                return []
-
-            checkouts = []
-            for line in result.stdout.strip().split("\n"):
-                if not line or "checkout:" not in line:
-                    continue
-
-                parts = line.split("|", 3)
-                if len(parts) >= 4:
-                    checkouts.append(
-                        {
-                            "hash": parts[0],
-                            "ref": parts[1],
-                            "message": parts[2],
-                            "date": parts[3],
-                        }
-                    )
-
-            return checkouts
-
-        except (subprocess.TimeoutExpired, subprocess.CalledProcessError):
-            return []
-
-    def _get_recent_merges(self, since: datetime | None = None) -> list[dict[str, Any]]:
-        """Get recent merges."""
+    def _get_recent_checkouts(self, since: datetime | None = None) -> list[_Checkout]:
+        """Get recent checkouts from reflog."""
         try:
-            cmd = [
-                "git",
-                "log",
-                "--merges",
-                "--pretty=format:%H|%an|%ad|%s",
-                "--date=iso",
-            ]
-
             if since:
-                cmd.extend(["--since", since.isoformat()])
+                cmd = (*_REFLOG_ARGV, "--since", since.isoformat())
             else:
-                cmd.extend(["-10"])
-
-            result = subprocess.run(
-                cmd, cwd=self.repo_path, capture_output=True, text=True, timeout=10
-            )
+                cmd = (*_REFLOG_ARGV, "-20")  # Last 20 checkouts
 
-            if result.returncode != 0:
-                return []
-
-            merges = []
-            for line in result.stdout.strip().split("\n"):
-                if not line:
-                    continue
-
-                parts = line.split("|", 3)
-                if len(parts) >= 4:
-                    merges.append(
-                        {
-                            "hash": parts[0],
-                            "author": parts[1],
-                            "date": parts[2],
-                            "message": parts[3],
-                        }
-                    )
+            checkouts = []
+            # git only emits checkout entries, so every record is kept
+            for line in self._iter_git_lines(cmd):
+                parts = line.split("\x1f", 3)
+                if len(parts) == 4:
+                    checkouts.append(_Checkout(*parts))
 
-            return merges
+            return checkouts
 
         except (subprocess.TimeoutExpired, subprocess.CalledProcessError):
             return []
 
-    def _create_commit_event(self, commit: dict[str, Any]) -> Event:
+    def _create_commit_event(self, commit: _Commit) -> Event:
         """Create commit event."""
-        # Parse ISO format datetime and make it timezone-naive
-        date_str = commit["date"]
-        if "+" in date_str:
-            date_str = date_str.split("+")[0].strip()
-        elif date_str.endswith("Z"):
-            date_str = date_str[:-1].strip()
-        if " " in date_str:
-            date_str = date_str.replace(" ", "T")
-        timestamp = datetime.fromisoformat(date_str)
-
-        content = f"커밋: {commit['message']}"
-        if len(commit["message"]) > 50:
-            content = f"커밋: {commit['message'][:50]}..."
+        timestamp = datetime.fromtimestamp(int(commit.date))
+
+        content = f"커밋: {commit.message}"
+        if len(commit.message) > 50:
+            content = f"커밋: {commit.message[:50]}..."
 
         return Event(
             timestamp=timestamp,
@@ -332,28 +483,20 @@ class GitCollector(Collector):
             content=content,
             metadata={
                 "action": "commit",
-                "hash": commit["hash"],
-                "author": commit["author"],
-                "email": commit["email"],
-                "message": commit["message"],
-                "full_message": commit["message"],
+                "hash": commit.hash,
+                "author": commit.author,
+                "email": commit.email,
+                "message": commit.message,
+                "full_message": commit.message,
             },
         )
 
-    def _create_checkout_event(self, checkout: dict[str, Any]) -> Event:
+    def _create_checkout_event(self, checkout: _Checkout) -> Event:
         """Create checkout event."""
-        # Parse ISO format datetime and make it timezone-naive
-        date_str = checkout["date"]
-        if "+" in date_str:
-            date_str = date_str.split("+")[0].strip()
-        elif date_str.endswith("Z"):
-            date_str = date_str[:-1].strip()
-        if " " in date_str:
-            date_str = date_str.replace(" ", "T")
-        timestamp = datetime.fromisoformat(date_str)
+        timestamp = datetime.fromtimestamp(int(checkout.date))
 
         # Extract branch name from checkout message
-        message = checkout["message"]
+        message = checkout.message
         if "checkout: moving from" in message:
             # Extract source and target branches
             parts = message.split("checkout: moving from ")[1].split(" to ")
@@ -373,27 +516,19 @@ class GitCollector(Collector):
             content=content,
             metadata={
                 "action": "checkout",
-                "hash": checkout["hash"],
-                "ref": checkout["ref"],
-                "message": checkout["message"],
+                "hash": checkout.hash,
+                "ref": checkout.ref,
+                "message": checkout.message,
             },
         )
 
-    def _create_merge_event(self, merge: dict[str, Any]) -> Event:
+    def _create_merge_event(self, merge: _Commit) -> Event:
         """Create merge event."""
-        # Parse ISO format datetime and make it timezone-naive
-        date_str = merge["date"]
-        if "+" in date_str:
-            date_str = date_str.split("+")[0].strip()
-        elif date_str.endswith("Z"):
-            date_str = date_str[:-1].strip()
-        if " " in date_str:
-            date_str = date_str.replace(" ", "T")
-        timestamp = datetime.fromisoformat(date_str)
-
-        content = f"머지: {merge['message']}"
-        if len(merge["message"]) > 50:
-            content = f"머지: {merge['message'][:50]}..."
+        timestamp = datetime.fromtimestamp(int(merge.date))
+
+        content = f"머지: {merge.message}"
+        if len(merge.message) > 50:
+            content = f"머지: {merge.message[:50]}..."
 
         return Event(
             timestamp=timestamp,
@@ -402,9 +537,9 @@ class GitCollector(Collector):
             content=content,
             metadata={
                 "action": "merge",
-                "hash": merge["hash"],
-                "author": merge["author"],
-                "message": merge["message"],
+                "hash": merge.hash,
+                "author": merge.author,
+                "message": merge.message,
             },
         )
 
@@ -418,71 +553,25 @@ class GitCollector(Collector):
             metadata={"action": "branch_change", "branch": branch},
         )
 
-    def _create_post_commit_hook(self, hooks_dir: Path) -> None:
-        """Create post-commit hook."""
-        # Try to find sayu in PATH or use pipx default location
-        import shutil
-
-        sayu_path = shutil.which("sayu")
-        if not sayu_path:
-            # Use pipx default location
-            home = Path.home()
-            sayu_path = home / ".local" / "bin" / "sayu"
-            if not sayu_path.exists():
-                sayu_path = "sayu"  # Fallback to PATH
-            else:
-                sayu_path = str(sayu_path)
-
-        hook_content = f"""#!/bin/sh
-# Sayu Git post-commit hook
-{sayu_path} collect >/dev/null 2>&1 || true
-"""
-        hook_path = hooks_dir / "post-commit"
-        hook_path.write_text(hook_content)
-        hook_path.chmod(0o755)
-
-    def _create_post_checkout_hook(self, hooks_dir: Path) -> None:
-        """Create post-checkout hook."""
-        # Try to find sayu in PATH or use pipx default location
-        import shutil
-
-        sayu_path = shutil.which("sayu")
-        if not sayu_path:
-            # Use pipx default location
-            home = Path.home()
-            sayu_path = home / ".local" / "bin" / "sayu"
-            if not sayu_path.exists():
-                sayu_path = "sayu"  # Fallback to PATH
-            else:
-                sayu_path = str(sayu_path)
-
+    def _write_hook_script(self, hooks_dir: Path) -> None:
+        """Write the shared hook script, leaving it alone if unchanged."""
         hook_content = f"""#!/bin/sh
-# Sayu Git post-checkout hook
-{sayu_path} collect >/dev/null 2>&1 || true
+# Sayu Git hook (shared by {", ".join(_HOOK_NAMES)})
+{_resolve_sayu_path()} collect >/dev/null 2>&1 || true
 """
-        hook_path = hooks_dir / "post-checkout"
-        hook_path.write_text(hook_content)
-        hook_path.chmod(0o755)
-
-    def _create_post_merge_hook(self, hooks_dir: Path) -> None:
-        """Create post-merge hook."""
-        # Try to find sayu in PATH or use pipx default location
-        import shutil
-
-        sayu_path = shutil.which("sayu")
-        if not sayu_path:
-            # Use pipx default location
-            home = Path.home()
-            sayu_path = home / ".local" / "bin" / "sayu"
-            if not sayu_path.exists():
-                sayu_path = "sayu"  # Fallback to PATH
-            else:
-                sayu_path = str(sayu_path)
+        script_path = hooks_dir / _HOOK_SCRIPT
+        try:
+            if script_path.read_text() == hook_content:
+                return
+        except OSError:
+            pass
+        script_path.write_text(hook_content)
+        script_path.chmod(0o755)
 
-        hook_content = f"""#!/bin/sh
-# Sayu Git post-merge hook
-{sayu_path} collect >/dev/null 2>&1 || true
-"""
-        hook_path = hooks_dir / "post-merge"
-        hook_path.write_text(hook_content)
-        hook_path.chmod(0o755)
+    def _link_hook(self, hooks_dir: Path, hook_name: str) -> None:
+        """Point a git hook at the shared hook script."""
+        hook_path = hooks_dir / hook_name
+        if hook_path.is_symlink() and os.readlink(hook_path) == _HOOK_SCRIPT:
+            return
+        hook_path.unlink(missing_ok=True)
+        os.symlink(_HOOK_SCRIPT, hook_path)
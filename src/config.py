@@ -1,9 +1,33 @@
 """Configuration management for Sayu."""
 
+import copy
 import os
+from functools import cached_property, lru_cache
 from pathlib import Path
+from typing import Any
 
-import yaml
+
+@lru_cache(maxsize=1)
+def _yaml_codec() -> tuple[Any, Any, Any]:
+    """Import PyYAML on first use and pick its fastest safe loader and dumper."""
+    import yaml
+
+    # Prefer the libyaml bindings when PyYAML was built with them
+    try:
+        from yaml import CSafeDumper as Dumper
+        from yaml import CSafeLoader as Loader
+    except ImportError:
+        from yaml import SafeDumper as Dumper
+        from yaml import SafeLoader as Loader
+
+    return yaml, Loader, Dumper
+
+
+# Parsed config files keyed by (resolved path, mtime in ns)
+_YAML_CACHE: dict[tuple[str, int], dict] = {}
+
+# Settings computed from Config.data and cached per instance
+_DERIVED_SETTINGS = ("db_path", "default_provider", "timeframe_hours")
 
 
 class Config:
@@ -14,19 +38,41 @@ class Config:
         self.config_path = config_path or Path.cwd() / ".sayu.yml"
         self.data = self._load_config()
 
+    @property
+    def data(self) -> dict:
+        """Get the raw configuration mapping."""
+        return self._data
+
+    @data.setter
+    def data(self, value: dict) -> None:
+        """Replace the configuration and drop values derived from it."""
+        self._data = value
+        for name in _DERIVED_SETTINGS:
+            self.__dict__.pop(name, None)
+
     def _load_config(self) -> dict:
         """Load configuration from file."""
-        if self.config_path.exists():
+        try:
+            mtime_ns = self.config_path.stat().st_mtime_ns
+        except OSError:
+            return {}
+
+        # Reparse only when the file changed; hand out a copy so callers
+        # can modify self.data without touching the cached entry
+        key = (str(self.config_path.resolve()), mtime_ns)
+        if key not in _YAML_CACHE:
+            yaml, loader, _ = _yaml_codec()
             with open(self.config_path) as f:
-                return yaml.safe_load(f) or {}
-        return {}
+                _YAML_CACHE[key] = yaml.load(f, Loader=loader) or {}
+        return copy.deepcopy(_YAML_CACHE[key])
 
     def save(self) -> None:
         """Save configuration to file."""
+        yaml, _, dumper = _yaml_codec()
         with open(self.config_path, "w") as f:
-            yaml.dump(self.data, f, default_flow_style=False)
+            yaml.dump(self.data, f, Dumper=dumper, default_flow_style=False)
 
-    @property
+    @cached_property
     def db_path(self) -> Path:
         """Get database path."""
         db_path = self.data.get("db_path", str(Path.home() / ".sayu" / "events.db"))
@@ -35,12 +81,12 @@ class Config:
         db_path = os.path.expanduser(db_path)
         return Path(db_path)
 
-    @property
+    @cached_property
     def default_provider(self) -> str:
         """Get default LLM provider."""
         return self.data.get("default_provider", "openrouter")
 
-    @property
+    @cached_property
     def timeframe_hours(self) -> int | None:
         """Get default timeframe in hours."""
         return self.data.get("timeframe_hours")
@@ -16,7 +16,11 @@ class EventType(Enum):
     COMMAND = "command"
 
 
-@dataclass
+# Direct value -> member lookup, bypassing Enum.__call__ for stored rows
+EVENT_TYPE_BY_VALUE = {member.value: member for member in EventType}
+
+
+@dataclass(slots=True)
 class Event:
     """Represents a collected event."""
 
@@ -41,7 +45,7 @@ class Event:
         """Create event from dictionary."""
         return cls(
             timestamp=datetime.fromisoformat(data["timestamp"]),
-            type=EventType(data["type"]),
+            type=EVENT_TYPE_BY_VALUE[data["type"]],
             source=data["source"],
             content=data["content"],
             metadata=data.get("metadata", {}),
@@ -2,10 +2,50 @@
 
 import json
 import sqlite3
+from collections.abc import Iterator
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
-from .collector import Event, EventType
+from .collector import EVENT_TYPE_BY_VALUE, Event, EventType
+
+
+def _to_microseconds(timestamp: datetime) -> int:
+    """Convert a timestamp to integer microseconds since the Unix epoch.
+
+    Naive timestamps are taken as local time, like the collectors write them.
+    """
+    return round(timestamp.timestamp() * 1_000_000)
+
+
+def _dump_metadata(metadata: dict) -> str:
+    """Serialize event metadata compactly, skipping the encoder when empty."""
+    if not metadata:
+        return "{}"
+    return json.dumps(metadata, ensure_ascii=False, separators=(",", ":"))
+
+
+@lru_cache(maxsize=32)
+def _events_query(
+    since: bool, until: bool, source: bool, event_type: bool, limit: bool
+) -> str:
+    """Build the event SELECT for a combination of active filters.
+
+    Parameters are bound in the order since, until, source, type, limit.
+    """
+    query = "SELECT timestamp, type, source, content, metadata FROM events WHERE 1=1"
+    if since:
+        query += " AND timestamp_us >= ?"
+    if until:
+        query += " AND timestamp_us <= ?"
+    if source:
+        query += " AND source = ?"
+    if event_type:
+        query += " AND type = ?"
+    query += " ORDER BY timestamp_us DESC"
+    if limit:
+        query += " LIMIT ?"
+    return query
 
 
 class Storage:
@@ -14,11 +54,27 @@ class Storage:
     def __init__(self, db_path: Path):
         """Initialize storage with database path."""
         self.db_path = db_path
+        self._conn = self._connect()
         self._init_db()
 
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection tuned for frequent small write transactions."""
+        conn = sqlite3.connect(self.db_path)
+        # WAL with synchronous=NORMAL avoids an fsync on every commit
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-65536")
+        conn.execute("PRAGMA mmap_size=268435456")
+        return conn
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
     def _init_db(self) -> None:
         """Initialize database schema."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn as conn:
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS events (
@@ -28,67 +84,119 @@ class Storage:
                     source TEXT NOT NULL,
                     content TEXT NOT NULL,
                     metadata TEXT,
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+                    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                    timestamp_us INTEGER
                 )
             """
             )
+            self._migrate_timestamp_us(conn)
+
+            # Range filters and ordering use the integer timestamp; the text
+            # column is only compared for duplicates via idx_timestamp_source
+            conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_timestamp_us ON events(timestamp_us)
+            """
+            )
             conn.execute(
                 """
-                CREATE INDEX IF NOT EXISTS idx_timestamp ON events(timestamp)
+                CREATE INDEX IF NOT EXISTS idx_source_timestamp_us
+                ON events(source, timestamp_us DESC)
             """
             )
+            # idx_dedup also covered content, which copied every event body
+            # into the index; the few rows sharing a timestamp and source are
+            # cheap to compare directly
+            for index in (
+                "idx_timestamp",
+                "idx_source",
+                "idx_source_timestamp",
+                "idx_dedup",
+            ):
+                conn.execute(f"DROP INDEX IF EXISTS {index}")
             conn.execute(
                 """
-                CREATE INDEX IF NOT EXISTS idx_source ON events(source)
+                CREATE INDEX IF NOT EXISTS idx_timestamp_source
+                ON events(timestamp, source)
             """
             )
 
+            # Summaries keyed by a hash of their prompt inputs, so unchanged
+            # frames are not sent to the LLM again
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS summaries (
+                    key TEXT PRIMARY KEY,
+                    summary TEXT NOT NULL,
+                    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+                )
+            """
+            )
+
+    def _migrate_timestamp_us(self, conn: sqlite3.Connection) -> None:
+        """Add and backfill the integer timestamp column on older databases."""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(events)")}
+        if "timestamp_us" not in columns:
+            conn.execute("ALTER TABLE events ADD COLUMN timestamp_us INTEGER")
+
+        rows = conn.execute(
+            "SELECT id, timestamp FROM events WHERE timestamp_us IS NULL"
+        ).fetchall()
+        if rows:
+            conn.executemany(
+                "UPDATE events SET timestamp_us = ? WHERE id = ?",
+                (
+                    (_to_microseconds(datetime.fromisoformat(timestamp)), row_id)
+                    for row_id, timestamp in rows
+                ),
+            )
+
     def add_event(self, event: Event) -> None:
         """Add an event to storage."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn as conn:
             conn.execute(
                 """
-                INSERT INTO events (timestamp, type, source, content, metadata)
-                VALUES (?, ?, ?, ?, ?)
+                INSERT INTO events
+                    (timestamp, type, source, content, metadata, timestamp_us)
+                VALUES (?, ?, ?, ?, ?, ?)
             """,
                 (
                     event.timestamp.isoformat(),
                     event.type.value,
                     event.source,
                     event.content,
-                    json.dumps(event.metadata),
+                    _dump_metadata(event.metadata),
+                    _to_microseconds(event.timestamp),
                 ),
             )
 
     def add_events(self, events: list[Event]) -> None:
         """Add multiple events to storage, avoiding duplicates."""
-        with sqlite3.connect(self.db_path) as conn:
-            # Check for existing events to avoid duplicates
-            for event in events:
-                # Check if this exact event already exists
-                cursor = conn.execute(
-                    """
-                    SELECT COUNT(*) FROM events
-                    WHERE timestamp = ? AND source = ? AND content = ?
-                """,
-                    (event.timestamp.isoformat(), event.source, event.content),
+        with self._conn as conn:
+            # One prepared statement for the whole batch; the duplicate check
+            # runs inside SQLite against idx_timestamp_source
+            conn.executemany(
+                """
+                INSERT INTO events
+                    (timestamp, type, source, content, metadata, timestamp_us)
+                SELECT ?1, ?2, ?3, ?4, ?5, ?6
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM events
+                    WHERE timestamp = ?1 AND source = ?3 AND content = ?4
                 )
-
-                if cursor.fetchone()[0] == 0:
-                    # Event doesn't exist, add it
-                    conn.execute(
-                        """
-                        INSERT INTO events (timestamp, type, source, content, metadata)
-                        VALUES (?, ?, ?, ?, ?)
-                    """,
-                        (
-                            event.timestamp.isoformat(),
-                            event.type.value,
-                            event.source,
-                            event.content,
-                            json.dumps(event.metadata),
-                        ),
+            """,
+                (
+                    (
+                        event.timestamp.isoformat(),
+                        event.type.value,
+                        event.source,
+                        event.content,
+                        _dump_metadata(event.metadata),
+                        _to_microseconds(event.timestamp),
                     )
+                    for event in events
+                ),
+            )
 
     def get_events(
         self,
@@ -97,70 +205,125 @@ class Storage:
         source: str | None = None,
         event_type: EventType | None = None,
         limit: int | None = None,
+        with_metadata: bool = True,
     ) -> list[Event]:
         """Get events with optional filters."""
-        query = (
-            "SELECT timestamp, type, source, content, metadata FROM events WHERE 1=1"
+        return list(
+            self.iter_events(since, until, source, event_type, limit, with_metadata)
         )
-        params = []
 
-        if since:
-            query += " AND timestamp >= ?"
-            params.append(since.isoformat())
+    def iter_events(
+        self,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        source: str | None = None,
+        event_type: EventType | None = None,
+        limit: int | None = None,
+        with_metadata: bool = True,
+    ) -> Iterator[Event]:
+        """
+        Yield events with optional filters as rows are read from SQLite.
 
+        Passing with_metadata=False leaves every event's metadata empty and
+        skips decoding the stored JSON, for callers that never read it.
+        """
+        params = []
+        if since:
+            params.append(_to_microseconds(since))
         if until:
-            query += " AND timestamp <= ?"
-            params.append(until.isoformat())
-
+            params.append(_to_microseconds(until))
         if source:
-            query += " AND source = ?"
             params.append(source)
-
         if event_type:
-            query += " AND type = ?"
             params.append(event_type.value)
-
-        query += " ORDER BY timestamp DESC"
-
         if limit:
-            query += " LIMIT ?"
             params.append(limit)
 
-        with sqlite3.connect(self.db_path) as conn:
+        query = _events_query(
+            bool(since), bool(until), bool(source), bool(event_type), bool(limit)
+        )
+
+        # Row conversion helpers bound to locals for the per-row loop
+        parse_timestamp = datetime.fromisoformat
+        event_type_of = EVENT_TYPE_BY_VALUE.__getitem__
+        loads = json.loads
+
+        with self._conn as conn:
             cursor = conn.execute(query, params)
-            return [
-                Event(
-                    timestamp=datetime.fromisoformat(row[0]),
-                    type=EventType(row[1]),
-                    source=row[2],
-                    content=row[3],
-                    metadata=json.loads(row[4]) if row[4] else {},
+            for timestamp, type_value, event_source, content, metadata in cursor:
+                # Empty metadata is stored as "{}"; skip the JSON parse
+                yield Event(
+                    parse_timestamp(timestamp),
+                    event_type_of(type_value),
+                    event_source,
+                    content,
+                    (
+                        loads(metadata)
+                        if with_metadata and metadata and metadata != "{}"
+                        else {}
+                    ),
                 )
-                for row in cursor
-            ]
 
     def get_latest_timestamp(self, source: str | None = None) -> datetime | None:
         """Get the timestamp of the latest event."""
-        query = "SELECT MAX(timestamp) FROM events"
+        query = "SELECT timestamp FROM events"
         params = []
 
         if source:
             query += " WHERE source = ?"
             params.append(source)
 
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(query, params)
-            result = cursor.fetchone()[0]
+        query += " ORDER BY timestamp_us DESC LIMIT 1"
+
+        with self._conn as conn:
+            row = conn.execute(query, params).fetchone()
+            result = row[0] if row else None
             if result:
-                # Parse ISO format datetime and make it timezone-naive
-                date_str = result
-                if "+" in date_str or date_str.endswith("Z"):
-                    # Remove timezone info to make it naive
-                    date_str = date_str.split("+")[0].split("Z")[0]
-                return datetime.fromisoformat(date_str)
+                # fromisoformat accepts any offset or "Z"; drop it to stay naive
+                return datetime.fromisoformat(result).replace(tzinfo=None)
             return None
 
+    def get_summary(self, key: str) -> str | None:
+        """Get a cached summary by its key."""
+        with self._conn as conn:
+            row = conn.execute(
+                "SELECT summary FROM summaries WHERE key = ?", (key,)
+            ).fetchone()
+            return row[0] if row else None
+
+    def add_summary(self, key: str, summary: str) -> None:
+        """Cache a summary under its key."""
+        with self._conn as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO summaries (key, summary) VALUES (?, ?)",
+                (key, summary),
+            )
+
+    def get_summaries(self, keys: list[str]) -> dict[str, str]:
+        """Get the cached summaries among `keys` with one query per 500 keys."""
+        summaries = {}
+        with self._conn as conn:
+            # Stay under SQLite's bound-parameter limit on older builds
+            for start in range(0, len(keys), 500):
+                chunk = keys[start : start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                summaries.update(
+                    conn.execute(
+                        f"SELECT key, summary FROM summaries WHERE key IN ({placeholders})",
+                        chunk,
+                    )
+                )
+        return summaries
+
+    def add_summaries(self, summaries: dict[str, str]) -> None:
+        """Cache several summaries in a single transaction."""
+        with self._conn as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO summaries (key, summary) VALUES (?, ?)",
+                summaries.items(),
+            )
+
     def clear(self) -> None:
         """Clear all events from storage."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn as conn:
             conn.execute("DELETE FROM events")
@@ -1,14 +1,21 @@
 """Summarization engine using external LLM commands."""
 
+import json
 import os
 import subprocess
-from datetime import timedelta
+import tempfile
+import threading
+import time
+from bisect import bisect_right
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from enum import Enum
+from hashlib import blake2b
+from operator import itemgetter
 from typing import Any
 
-from openai import OpenAI
-
-from ..core import Event
+from ..core import Event, Storage
 
 
 class LLMProvider(Enum):
@@ -20,119 +27,472 @@ class LLMProvider(Enum):
     CUSTOM = "custom"
 
 
+# Built-in CLI summarizers; the prompt is appended as the last argument
+_PROVIDER_COMMANDS = {
+    LLMProvider.CLAUDE: ("claude", "-c"),
+    LLMProvider.GEMINI: ("gemini", "-p"),
+}
+
+# Upper bound on timeframes summarized at the same time
+_MAX_CONCURRENT_SUMMARIES = 8
+
+# Default token budget for one session context, see _prepare_context
+_MAX_PROMPT_TOKENS = 6000
+
+# A single event may use at most this fraction of the prompt budget, so one
+# pasted log or long tool output cannot crowd out the rest of the session
+_MAX_EVENT_SHARE = 1 / 8
+
+# Retries for rate limits (429), server errors, timeouts and dropped
+# connections; the OpenAI SDK backs off exponentially with jitter and
+# honors Retry-After
+_MAX_RETRIES = 6
+
+# Context line prefixes for conversation events, keyed by metadata type
+_SPEAKER_PREFIXES = {"user": "User:", "assistant": "Assistant:"}
+
+# Part of every summary cache key; bump when prompts change so that
+# summaries written with the old prompts are not reused
+_SUMMARY_PROMPT_VERSION = 1
+
+
+def _is_failed_summary(summary: str) -> bool:
+    """Tell error messages apart from summaries, which are worth caching."""
+    return summary.startswith("Error") or summary == "Summary generation failed"
+
+
+# Accepted SAYU_OPENROUTER_SORT values for OpenRouter provider routing
+_OPENROUTER_SORTS = frozenset({"throughput", "price", "latency"})
+
+
+def _openrouter_routing() -> dict[str, Any] | None:
+    """Return the OpenRouter provider routing body, if any is configured."""
+    sort = os.getenv("SAYU_OPENROUTER_SORT", "throughput").lower()
+    if sort not in _OPENROUTER_SORTS:
+        return None
+    return {"provider": {"sort": sort}}
+
+
+def _system_message(prompt: str, model: str) -> dict[str, Any]:
+    """
+    Build the system message, marking it cacheable for Anthropic models.
+
+    OpenAI models cache identical prompt prefixes automatically. Anthropic
+    models only cache blocks with cache_control, and only once the cached
+    prefix reaches their minimum length (1024 tokens, 2048 for Haiku);
+    shorter prompts are sent as usual.
+    """
+    if not model.startswith("anthropic/"):
+        return {"role": "system", "content": prompt}
+    return {
+        "role": "system",
+        "content": [
+            {"type": "text", "text": prompt, "cache_control": {"type": "ephemeral"}}
+        ],
+    }
+
+
+# Batch API job states after which polling stops
+_BATCH_FINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+# Default seconds to wait for a Batch API job before cancelling it and
+# summarizing directly; the job itself may take up to 24 hours
+_BATCH_TIMEOUT = 600
+
+# Rough size limit for the sessions packed into one OpenRouter request
+_BATCH_CONTEXT_TOKENS = 8000
+
+
+def _estimate_tokens(text: str) -> int:
+    """
+    Estimate the token count of `text` without a tokenizer.
+
+    English and code average about four characters per token, but Hangul
+    and other non-ASCII scripts come close to a token per character, so
+    the two are counted separately.
+    """
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    return ascii_chars // 4 + len(text) - ascii_chars
+
+
+def _max_prompt_tokens() -> int:
+    """Read SAYU_MAX_PROMPT_TOKENS, falling back to the default."""
+    try:
+        return int(os.getenv("SAYU_MAX_PROMPT_TOKENS") or _MAX_PROMPT_TOKENS)
+    except ValueError:
+        return _MAX_PROMPT_TOKENS
+
+
+def _batch_timeout() -> float:
+    """Read SAYU_BATCH_TIMEOUT, falling back to the default."""
+    try:
+        return float(os.getenv("SAYU_BATCH_TIMEOUT") or _BATCH_TIMEOUT)
+    except ValueError:
+        return _BATCH_TIMEOUT
+
+
+def _env_rate(name: str) -> float:
+    """Read a per-minute limit, treating unset or invalid values as no limit."""
+    try:
+        return float(os.getenv(name) or 0)
+    except ValueError:
+        return 0
+
+
+def _truncate_tokens(text: str, limit: int) -> str:
+    """Cut `text` to at most `limit` estimated tokens."""
+    tokens = _estimate_tokens(text)
+    while tokens > limit:
+        # Proportional cuts overshoot when scripts are mixed, so repeat
+        text = text[: len(text) * limit // tokens]
+        tokens = _estimate_tokens(text)
+    return text
+
+
+def _chunk_contexts(contexts: list[str]) -> list[list[str]]:
+    """Group consecutive contexts into batches within _BATCH_CONTEXT_TOKENS."""
+    chunks: list[list[str]] = []
+    current: list[str] = []
+    size = 0
+    for context in contexts:
+        tokens = _estimate_tokens(context)
+        if current and size + tokens > _BATCH_CONTEXT_TOKENS:
+            chunks.append(current)
+            current = []
+            size = 0
+        current.append(context)
+        size += tokens
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _context_line(event: Event) -> str:
+    """Format one event as a line of LLM context."""
+    # Same text as strftime("%Y-%m-%d %H:%M:%S"), minus any UTC offset
+    timestamp = event.timestamp.isoformat(" ", "seconds")[:19]
+
+    # Format based on event metadata
+    prefix = _SPEAKER_PREFIXES.get(event.metadata.get("type"))
+    if prefix is None:
+        prefix = f"{event.source}:"
+
+    return f"[{timestamp}] {prefix} {event.content}"
+
+
+def _join_context(lines: list[str], timestamps: list[datetime]) -> str:
+    """
+    Join context lines, keeping within SAYU_MAX_PROMPT_TOKENS.
+
+    Lines longer than _MAX_EVENT_SHARE of the budget are cut first. Over
+    the budget, the lines of the newest events (by the naive `timestamps`)
+    that fit are kept, in their original order.
+    """
+    separator = "\\n"
+    budget = _max_prompt_tokens()
+    event_limit = int(budget * _MAX_EVENT_SHARE)
+    lines = [_truncate_tokens(line, event_limit) for line in lines]
+    sizes = [_estimate_tokens(line) + 1 for line in lines]
+    if sum(sizes) <= budget:
+        return separator.join(lines)
+
+    kept = set()
+    size = 0
+    newest_first = sorted(range(len(lines)), key=timestamps.__getitem__, reverse=True)
+    for index in newest_first:
+        size += sizes[index]
+        if size > budget:
+            break
+        kept.add(index)
+
+    return separator.join(line for index, line in enumerate(lines) if index in kept)
+
+
+class _RateLimiter:
+    """
+    Token buckets for requests and tokens per minute, shared across threads.
+
+    Each bucket refills continuously at its per-minute rate, up to one
+    minute's worth of capacity, following the OpenAI cookbook's parallel
+    request processor.
+    """
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+        """Initialize full buckets; a rate of 0 disables that limit."""
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._requests = requests_per_minute
+        self._tokens = tokens_per_minute
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "_RateLimiter | None":
+        """Create a limiter from SAYU_RPM and SAYU_TPM, if either is set."""
+        rpm = _env_rate("SAYU_RPM")
+        tpm = _env_rate("SAYU_TPM")
+        if rpm <= 0 and tpm <= 0:
+            return None
+        return cls(rpm, tpm)
+
+    def acquire(self, tokens: int) -> None:
+        """Block until one request of about `tokens` tokens fits both limits."""
+        # A request larger than a minute's budget waits for a full bucket
+        tokens = min(tokens, self.tokens_per_minute) if self.tokens_per_minute else 0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                elapsed = now - self._updated
+                self._updated = now
+                if self.requests_per_minute:
+                    self._requests = min(
+                        self.requests_per_minute,
+                        self._requests + elapsed * self.requests_per_minute / 60,
+                    )
+                if self.tokens_per_minute:
+                    self._tokens = min(
+                        self.tokens_per_minute,
+                        self._tokens + elapsed * self.tokens_per_minute / 60,
+                    )
+
+                wait = 0.0
+                if self.requests_per_minute and self._requests < 1:
+                    wait = (1 - self._requests) * 60 / self.requests_per_minute
+                if self.tokens_per_minute and self._tokens < tokens:
+                    wait = max(
+                        wait, (tokens - self._tokens) * 60 / self.tokens_per_minute
+                    )
+                if not wait:
+                    self._requests -= 1
+                    self._tokens -= tokens
+                    return
+            time.sleep(wait)
+
+
 class Summarizer:
     """Summarize events using external LLM commands."""
 
-    def __init__(self, provider: LLMProvider = LLMProvider.OPENROUTER):
-        """Initialize summarizer with LLM provider."""
+    def __init__(
+        self,
+        provider: LLMProvider = LLMProvider.OPENROUTER,
+        storage: Storage | None = None,
+    ):
+        """Initialize summarizer with LLM provider and optional summary cache."""
         self.provider = provider
+        self.storage = storage
         self.openrouter_client = None
+        self.batch_client = None
+        self.rate_limiter = None
 
         if provider == LLMProvider.OPENROUTER:
             api_key = os.getenv("SAYU_OPENROUTER_API_KEY")
             if api_key:
+                # Imported here so commands that never summarize skip loading
+                # the OpenAI SDK and its HTTP stack
+                from openai import OpenAI
+
                 self.openrouter_client = OpenAI(
                     base_url="https://openrouter.ai/api/v1",
                     api_key=api_key,
+                    max_retries=_MAX_RETRIES,
+                )
+                self.rate_limiter = _RateLimiter.from_env()
+
+            # OpenRouter has no batch endpoint, so batch jobs go to OpenAI
+            batch_api_key = os.getenv("SAYU_OPENAI_API_KEY")
+            if (
+                batch_api_key
+                and os.getenv("SAYU_USE_BATCH_API", "false").lower() == "true"
+            ):
+                from openai import OpenAI
+
+                self.batch_client = OpenAI(
+                    api_key=batch_api_key, max_retries=_MAX_RETRIES
                 )
 
     def summarize_timeframe(
         self,
-        events: list[Event],
+        events: Iterable[Event],
         timeframe: timedelta,
         command: str | None = None,
         structured: bool = False,
+        on_progress: Callable[[str], None] | None = None,
     ) -> list[dict[str, Any]]:
         """
         Summarize events within timeframes.
 
         Args:
-            events: List of events to summarize
+            events: Events to summarize, in any order (e.g. Storage.iter_events)
             timeframe: Duration of each timeframe
             command: Custom command to use for summarization
             structured: Use structured output format if available
+            on_progress: Receives status messages while a Batch API job runs
 
         Returns:
             List of summaries with timeframe info
         """
-        if not events:
-            return []
-
-        # Sort events by timestamp (make all timezone-naive for comparison)
-        def get_naive_timestamp(event):
+        # Make each timestamp timezone-naive and format its context line in
+        # the same pass, then sort on the timestamp; iterators are consumed
+        # in a single pass
+        stamped_events = []
+        for event in events:
             timestamp = event.timestamp
             if timestamp.tzinfo is not None:
-                return timestamp.replace(tzinfo=None)
-            return timestamp
-
-        sorted_events = sorted(events, key=get_naive_timestamp)
+                timestamp = timestamp.replace(tzinfo=None)
+            stamped_events.append((timestamp, _context_line(event), event))
+        if not stamped_events:
+            return []
+        stamped_events.sort(key=itemgetter(0))
+        timestamps = [timestamp for timestamp, _, _ in stamped_events]
+        lines = [line for _, line, _ in stamped_events]
 
-        # Group events by timeframe
+        # Group events by timeframe: each frame runs from its first event up
+        # to the last event within `timeframe` of it, found by binary search
         timeframes = []
-        current_frame = []
-        frame_start = sorted_events[0].timestamp
-
-        for event in sorted_events:
-            # Make timestamps timezone-naive for comparison
-            event_timestamp = event.timestamp
-            if event_timestamp.tzinfo is not None:
-                event_timestamp = event_timestamp.replace(tzinfo=None)
-
-            if event_timestamp - frame_start <= timeframe:
-                current_frame.append(event)
-            else:
-                if current_frame:
-                    timeframes.append(
-                        {
-                            "start": frame_start,
-                            "end": current_frame[-1].timestamp,
-                            "events": current_frame,
-                        }
-                    )
-                current_frame = [event]
-                frame_start = event_timestamp
-
-        # Add last frame
-        if current_frame:
+        start_index = 0
+        while start_index < len(timestamps):
+            frame_start = timestamps[start_index]
+            end_index = bisect_right(
+                timestamps, frame_start + timeframe, lo=start_index
+            )
             timeframes.append(
                 {
                     "start": frame_start,
-                    "end": current_frame[-1].timestamp,
-                    "events": current_frame,
+                    "end": stamped_events[end_index - 1][2].timestamp,
+                    "event_count": end_index - start_index,
+                    "context": _join_context(
+                        lines[start_index:end_index],
+                        timestamps[start_index:end_index],
+                    ),
                 }
             )
+            start_index = end_index
+
+        frame_summaries = self._summarize_contexts(
+            [frame["context"] for frame in timeframes],
+            command,
+            structured,
+            allow_batch=True,
+            on_progress=on_progress,
+        )
+
+        return [
+            {
+                "start": frame["start"],
+                "end": frame["end"],
+                "event_count": frame["event_count"],
+                "summary": summary,
+            }
+            for frame, summary in zip(timeframes, frame_summaries, strict=True)
+        ]
+
+    def _summarize_contexts(
+        self,
+        contexts: list[str],
+        command: str | None,
+        structured: bool,
+        on_token: Callable[[str], None] | None = None,
+        allow_batch: bool = False,
+        on_progress: Callable[[str], None] | None = None,
+    ) -> list[str]:
+        """
+        Summarize session contexts, reusing cached summaries when possible.
 
-        # Summarize each timeframe
-        summaries = []
-        for frame in timeframes:
-            summary = self._summarize_events(
-                frame["events"], command=command, structured=structured
-            )
-            summaries.append(
-                {
-                    "start": frame["start"],
-                    "end": frame["end"],
-                    "event_count": len(frame["events"]),
-                    "summary": summary,
-                }
-            )
+        Only callers that can wait for a report pass allow_batch; interactive
+        summaries always go to the model directly.
+        """
+        summaries: list[str | None] = [None] * len(contexts)
+        keys = []
+        if self.storage:
+            keys = [
+                self._summary_key(context, command, structured) for context in contexts
+            ]
+            cached = self.storage.get_summaries(keys)
+            summaries = [cached.get(key) for key in keys]
+
+        missing = [index for index, summary in enumerate(summaries) if summary is None]
+        if missing:
+            pending = [contexts[index] for index in missing]
+            results = None
+            if allow_batch and self.batch_client and not structured:
+                # Overnight reports can wait for the cheaper Batch API
+                results = self._summarize_with_batch_api(pending, on_progress)
+            if results is None:
+                results = self._summarize_frames(pending, command, structured, on_token)
+
+            fresh = {}
+            for index, summary in zip(missing, results, strict=True):
+                summaries[index] = summary
+                if self.storage and not _is_failed_summary(summary):
+                    fresh[keys[index]] = summary
+            if fresh:
+                self.storage.add_summaries(fresh)
 
         return summaries
 
+    def _summary_key(self, context: str, command: str | None, structured: bool) -> str:
+        """Hash everything that determines a summary into a cache key."""
+        if self.provider == LLMProvider.OPENROUTER and self.openrouter_client:
+            engine = os.getenv("SAYU_LLM_MODEL", "openai/gpt-4o-mini")
+        else:
+            engine = command or self.provider.value
+        parts = (str(_SUMMARY_PROMPT_VERSION), engine, str(structured), context)
+        return blake2b("\0".join(parts).encode(), digest_size=16).hexdigest()
+
+    def _summarize_frames(
+        self,
+        contexts: list[str],
+        command: str | None,
+        structured: bool,
+        on_token: Callable[[str], None] | None = None,
+    ) -> list[str]:
+        """Summarize session contexts with regular requests or CLI commands."""
+        # Summarize each timeframe; the calls are network- or subprocess-bound,
+        # so frames are summarized concurrently (map keeps their order)
+        workers = min(_MAX_CONCURRENT_SUMMARIES, len(contexts))
+        if (
+            self.provider == LLMProvider.OPENROUTER
+            and self.openrouter_client
+            and not structured
+            and len(contexts) > 1
+        ):
+            # Several frames share one request, see _summarize_batch
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                batches = executor.map(self._summarize_batch, _chunk_contexts(contexts))
+                return [summary for batch in batches for summary in batch]
+        else:
+
+            def summarize_frame(context: str) -> str:
+                return self._summarize_context(
+                    context, command=command, structured=structured, on_token=on_token
+                )
+
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                return list(executor.map(summarize_frame, contexts))
+
     def summarize_all(
         self,
         events: list[Event],
         command: str | None = None,
         structured: bool = False,
+        on_token: Callable[[str], None] | None = None,
     ) -> str:
-        """Summarize all events together."""
-        return self._summarize_events(events, command=command, structured=structured)
+        """
+        Summarize all events together.
+
+        on_token, if given, receives the summary text as it streams in from
+        OpenRouter; other providers return the summary in one piece.
+        """
+        return self._summarize_events(
+            events, command=command, structured=structured, on_token=on_token
+        )
 
     def _summarize_events(
         self,
         events: list[Event],
         command: str | None = None,
         structured: bool = False,
+        on_token: Callable[[str], None] | None = None,
     ) -> str:
         """Summarize a list of events using LLM."""
         if not events:
@@ -140,21 +500,37 @@ class Summarizer:
 
         # Prepare context
         context = self._prepare_context(events)
+        return self._summarize_contexts([context], command, structured, on_token)[0]
 
+    def _summarize_context(
+        self,
+        context: str,
+        command: str | None = None,
+        structured: bool = False,
+        on_token: Callable[[str], None] | None = None,
+    ) -> str:
+        """Summarize a prepared session context using LLM."""
         # Use OpenRouter if configured
         if self.provider == LLMProvider.OPENROUTER and self.openrouter_client:
-            return self._summarize_with_openrouter(context, structured=structured)
+            return self._summarize_with_openrouter(
+                context, structured=structured, on_token=on_token
+            )
 
-        # Build command for CLI-based providers
+        # Build command for CLI-based providers; custom commands are shell
+        # templates, built-in ones are argv lists that need no quoting
         if command:
-            cmd = command.replace("{context}", context)
+            cmd: str | list[str] = command.replace("{context}", context)
         else:
             cmd = self._get_default_command(context)
 
         # Execute command
         try:
             result = subprocess.run(
-                cmd, shell=True, capture_output=True, text=True, timeout=30
+                cmd,
+                shell=isinstance(cmd, str),
+                capture_output=True,
+                text=True,
+                timeout=30,
             )
 
             if result.returncode == 0:
@@ -170,27 +546,22 @@ class Summarizer:
     def _prepare_context(self, events: list[Event]) -> str:
         """Prepare context from events for LLM."""
         lines = []
-
+        timestamps = []
         for event in events:
-            timestamp = event.timestamp.strftime("%Y-%m-%d %H:%M:%S")
-            source = event.source
-
-            # Format based on event metadata
-            if event.metadata.get("type") == "user":
-                prefix = "User:"
-            elif event.metadata.get("type") == "assistant":
-                prefix = "Assistant:"
-            else:
-                prefix = f"{source}:"
+            lines.append(_context_line(event))
+            timestamps.append(event.timestamp.replace(tzinfo=None))
+        return _join_context(lines, timestamps)
 
-            lines.append(f"[{timestamp}] {prefix} {event.content[:500]}")
-
-        return "\\n".join(lines)
-
-    def _summarize_with_openrouter(self, context: str, structured: bool = False) -> str:
-        """Summarize using OpenRouter API."""
+    def _summarize_with_openrouter(
+        self,
+        context: str,
+        structured: bool = False,
+        on_token: Callable[[str], None] | None = None,
+    ) -> str:
+        """Summarize using OpenRouter API, streaming unstructured summaries."""
         try:
             model = os.getenv("SAYU_LLM_MODEL", "openai/gpt-4o-mini")
+            self._throttle(context, max_tokens=500)
 
             # Check if we should use structured output
             use_structured = (
@@ -207,10 +578,10 @@ class Summarizer:
                     },
                     model=model,
                     messages=[
-                        {
-                            "role": "system",
-                            "content": "Summarize work sessions in JSON format with: title (brief), tasks (3 items max with ✅/🔄/❌ prefix), summary (2-3 sentences).",
-                        },
+                        _system_message(
+                            "Summarize work sessions in JSON format with: title (brief), tasks (3 items max with ✅/🔄/❌ prefix), summary (2-3 sentences).",
+                            model,
+                        ),
                         {
                             "role": "user",
                             "content": f"Summarize this session (max 3 tasks):\n\n{context}",
@@ -218,12 +589,11 @@ class Summarizer:
                     ],
                     max_tokens=500,  # Enough for git commit message
                     temperature=0.7,
+                    extra_body=_openrouter_routing(),
                     response_format={"type": "json_object"},
                 )
 
                 # Get the response
-                import json
-
                 response_message = completion.choices[0].message
 
                 # Try to parse JSON from content if parsed is not available
@@ -254,18 +624,19 @@ class Summarizer:
                 else:
                     return response_message.content
             else:
-                # Regular unstructured output
-                completion = self.openrouter_client.chat.completions.create(
+                # Regular unstructured output, streamed so on_token sees text
+                # as soon as it is generated
+                stream = self.openrouter_client.chat.completions.create(
                     extra_headers={
                         "HTTP-Referer": "https://github.com/hwisu/sayu",
                         "X-Title": "Sayu - AI Conversation Tracker",
                     },
                     model=model,
                     messages=[
-                        {
-                            "role": "system",
-                            "content": "You are a helpful assistant that summarizes work sessions concisely. Focus on what was accomplished.",
-                        },
+                        _system_message(
+                            "You are a helpful assistant that summarizes work sessions concisely. Focus on what was accomplished.",
+                            model,
+                        ),
                         {
                             "role": "user",
                             "content": f"Create a brief summary (2-3 lines) for this work session:\n\n{context}",
@@ -273,12 +644,23 @@ class Summarizer:
                     ],
                     max_tokens=500,
                     temperature=0.7,
+                    extra_body=_openrouter_routing(),
+                    stream=True,
                 )
 
-                if completion and completion.choices and len(completion.choices) > 0:
-                    result = completion.choices[0].message.content
-                    if result:
-                        return result
+                parts = []
+                for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    token = chunk.choices[0].delta.content
+                    if token:
+                        parts.append(token)
+                        if on_token:
+                            on_token(token)
+
+                result = "".join(parts)
+                if result:
+                    return result
 
                 return "Summary generation failed"
 
@@ -287,16 +669,157 @@ class Summarizer:
 
             return f"Error using OpenRouter: {str(e)}\n{traceback.format_exc()}"
 
-    def _get_default_command(self, context: str) -> str:
-        """Get default command for provider."""
-        # Escape single quotes in context
-        escaped_context = context.replace("'", "'\"'\"'")
+    def _throttle(self, prompt: str, max_tokens: int) -> None:
+        """Wait for rate limit capacity for the prompt and its reply."""
+        if self.rate_limiter:
+            self.rate_limiter.acquire(_estimate_tokens(prompt) + max_tokens)
+
+    def _summarize_batch(self, contexts: list[str]) -> list[str]:
+        """
+        Summarize several sessions with a single OpenRouter request.
 
-        if self.provider == LLMProvider.CLAUDE:
-            return f"claude -c 'Summarize this work session:\\n{escaped_context}'"
-        elif self.provider == LLMProvider.GEMINI:
-            return f"gemini -p 'Summarize this work session:\\n{escaped_context}'"
+        The model returns one JSON entry per numbered session. If the reply
+        cannot be mapped back onto every session, each one is summarized
+        with its own request instead.
+        """
+        if len(contexts) > 1:
+            sessions = "\n\n".join(
+                f"### {number}\n{context}"
+                for number, context in enumerate(contexts, start=1)
+            )
+            try:
+                model = os.getenv("SAYU_LLM_MODEL", "openai/gpt-4o-mini")
+                self._throttle(sessions, max_tokens=500 * len(contexts))
+                completion = self.openrouter_client.chat.completions.create(
+                    extra_headers={
+                        "HTTP-Referer": "https://github.com/hwisu/sayu",
+                        "X-Title": "Sayu - AI Conversation Tracker",
+                    },
+                    model=model,
+                    messages=[
+                        _system_message(
+                            'You are a helpful assistant that summarizes work sessions concisely. Focus on what was accomplished. Reply in JSON as {"summaries": [{"id": <session number>, "text": <summary>}]} with one entry per session.',
+                            model,
+                        ),
+                        {
+                            "role": "user",
+                            "content": f"Create a brief summary (2-3 lines) for each of these {len(contexts)} work sessions:\n\n{sessions}",
+                        },
+                    ],
+                    max_tokens=500 * len(contexts),
+                    temperature=0.7,
+                    extra_body=_openrouter_routing(),
+                    response_format={"type": "json_object"},
+                )
+                entries = json.loads(completion.choices[0].message.content)
+                texts = {
+                    int(entry["id"]): str(entry["text"])
+                    for entry in entries["summaries"]
+                }
+                return [texts[number] for number in range(1, len(contexts) + 1)]
+            except Exception:
+                pass  # Fall back to one request per session
+
+        return [self._summarize_with_openrouter(context) for context in contexts]
+
+    def _summarize_with_batch_api(
+        self,
+        contexts: list[str],
+        on_progress: Callable[[str], None] | None = None,
+    ) -> list[str] | None:
+        """
+        Summarize sessions through the OpenAI Batch API.
+
+        Blocks until the batch finishes, reporting its status to on_progress
+        after every poll. A batch still running after SAYU_BATCH_TIMEOUT
+        seconds is cancelled. Returns None if the batch fails or times out,
+        so callers can fall back to regular requests.
+        """
+        model = os.getenv("SAYU_LLM_MODEL", "openai/gpt-4o-mini").removeprefix(
+            "openai/"
+        )
+        try:
+            with tempfile.TemporaryFile("w+b", suffix=".jsonl") as requests_file:
+                for number, context in enumerate(contexts):
+                    request = {
+                        "custom_id": f"frame-{number}",
+                        "method": "POST",
+                        "url": "/v1/chat/completions",
+                        "body": {
+                            "model": model,
+                            "messages": [
+                                {
+                                    "role": "system",
+                                    "content": "You are a helpful assistant that summarizes work sessions concisely. Focus on what was accomplished.",
+                                },
+                                {
+                                    "role": "user",
+                                    "content": f"Create a brief summary (2-3 lines) for this work session:\n\n{context}",
+                                },
+                            ],
+                            "max_tokens": 500,
+                            "temperature": 0.7,
+                        },
+                    }
+                    requests_file.write(json.dumps(request).encode() + b"\n")
+                requests_file.seek(0)
+                input_file = self.batch_client.files.create(
+                    file=("sayu-batch.jsonl", requests_file), purpose="batch"
+                )
+
+            batch = self.batch_client.batches.create(
+                input_file_id=input_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h",
+            )
+
+            # Poll every 30 seconds at first, backing off to every 10 minutes
+            deadline = time.monotonic() + _batch_timeout()
+            delay = 30.0
+            while batch.status not in _BATCH_FINAL_STATUSES:
+                if on_progress:
+                    counts = batch.request_counts
+                    done = f" ({counts.completed}/{counts.total})" if counts else ""
+                    on_progress(f"Batch {batch.id} {batch.status}{done}")
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.batch_client.batches.cancel(batch.id)
+                    return None
+                time.sleep(min(delay, remaining))
+                delay = min(delay * 2, 600.0)
+                batch = self.batch_client.batches.retrieve(batch.id)
+
+            if batch.status != "completed" or not batch.output_file_id:
+                return None
+
+            output = self.batch_client.files.content(batch.output_file_id).text
+            texts = {}
+            for line in output.splitlines():
+                if not line:
+                    continue
+                result = json.loads(line)
+                body = (result.get("response") or {}).get("body") or {}
+                choices = body.get("choices") or [{}]
+                texts[result["custom_id"]] = (
+                    choices[0].get("message", {}).get("content")
+                )
+
+            return [
+                texts.get(f"frame-{number}") or "Summary generation failed"
+                for number in range(len(contexts))
+            ]
+
+        except Exception:
+            return None
+
+    def _get_default_command(self, context: str) -> list[str]:
+        """Get default command for provider."""
+        # The context is passed as its own argument, so no shell quoting
+        # (and no escaped copy of the context) is needed
+        prefix = _PROVIDER_COMMANDS.get(self.provider)
+        if prefix is not None:
+            return [*prefix, f"Summarize this work session:\\n{context}"]
         elif self.provider == LLMProvider.OPENROUTER:
-            return "echo 'OpenRouter provider requires API key'"
+            return ["echo", "OpenRouter provider requires API key"]
         else:
-            return f"echo 'No default command for {self.provider}'"
+            return ["echo", f"No default command for {self.provider}"]
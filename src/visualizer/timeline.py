@@ -1,10 +1,24 @@
 """Timeline visualization for events."""
 
+from collections import Counter
+from datetime import datetime
+
 from rich.console import Console
 from rich.table import Table
 
 from ..core import Event
 
+# Content prefixes for conversation events, keyed by metadata type
+_SPEAKER_EMOJI = {"user": "👤 ", "assistant": "🤖 "}
+
+
+def _naive_timestamp(event: Event) -> datetime:
+    """Return the event timestamp without timezone, for comparisons."""
+    timestamp = event.timestamp
+    if timestamp.tzinfo is not None:
+        return timestamp.replace(tzinfo=None)
+    return timestamp
+
 
 class TimelineVisualizer:
     """Visualize events as a timeline."""
@@ -25,14 +39,9 @@ class TimelineVisualizer:
             self.console.print("[yellow]No events to display[/yellow]")
             return
 
-        # Sort events by timestamp (make all timezone-naive for comparison)
-        def get_naive_timestamp(event):
-            timestamp = event.timestamp
-            if timestamp.tzinfo is not None:
-                return timestamp.replace(tzinfo=None)
-            return timestamp
-
-        sorted_events = sorted(events, key=get_naive_timestamp)
+        # Sort events by timestamp (make all timezone-naive for comparison);
+        # sorted() computes each key once
+        sorted_events = sorted(events, key=_naive_timestamp)
 
         # Create table
         table = Table(title="Event Timeline", show_header=True)
@@ -43,7 +52,8 @@ class TimelineVisualizer:
 
         # Add events to table
         for event in sorted_events:
-            time_str = event.timestamp.strftime("%Y-%m-%d %H:%M:%S")
+            # Same text as strftime("%Y-%m-%d %H:%M:%S"), minus any UTC offset
+            time_str = event.timestamp.isoformat(" ", "seconds")[:19]
 
             # Format content
             if show_content:
@@ -52,10 +62,9 @@ class TimelineVisualizer:
                 content = event.content.replace("\n", " ")
 
             # Add metadata hints
-            if event.metadata.get("type") == "user":
-                content = f"👤 {content}"
-            elif event.metadata.get("type") == "assistant":
-                content = f"🤖 {content}"
+            prefix = _SPEAKER_EMOJI.get(event.metadata.get("type"))
+            if prefix:
+                content = prefix + content
 
             table.add_row(time_str, event.source, event.type.value, content)
 
@@ -103,22 +112,14 @@ class TimelineVisualizer:
             return
 
         # Calculate stats
-        sources = {}
-        types = {}
-
-        for event in events:
-            sources[event.source] = sources.get(event.source, 0) + 1
-            types[event.type.value] = types.get(event.type.value, 0) + 1
-
-        # Time range (make all timezone-naive for comparison)
-        def get_naive_timestamp(event):
-            timestamp = event.timestamp
-            if timestamp.tzinfo is not None:
-                return timestamp.replace(tzinfo=None)
-            return timestamp
-
-        sorted_events = sorted(events, key=get_naive_timestamp)
-        time_range = sorted_events[-1].timestamp - sorted_events[0].timestamp
+        sources = Counter(event.source for event in events)
+        types = Counter(event.type.value for event in events)
+
+        # Time range (make all timezone-naive for comparison); only the
+        # ends are needed, so there is no need to sort
+        first_event = min(events, key=_naive_timestamp)
+        last_event = max(events, key=_naive_timestamp)
+        time_range = last_event.timestamp - first_event.timestamp
 
         # Display stats
         self.console.print("\n[bold]Event Statistics[/bold]")